@@ -1,12 +1,23 @@
-from typing import Dict
-from .standardized_agents import get_standardized_agents, BaselineAgent
+from typing import Dict, List, Optional
+from .standardized_agents import get_standardized_agents, BaselineAgent, STANDARDIZED_AGENT_FACTORIES
 from .skeleton_rl_agent import create_skeleton_optimization_agent
 
-def get_baseline_agents(env) -> Dict[str, BaselineAgent]:
+def get_baseline_agents(env, seed: Optional[int] = None, record_history: bool = True) -> Dict[str, BaselineAgent]:
     """Get all available baseline agents"""
     agents = get_standardized_agents(env)
     
     # Add skeleton optimization agent for students to improve
-    agents['skeleton_optimization'] = create_skeleton_optimization_agent(env)
+    agents['skeleton_optimization'] = create_skeleton_optimization_agent(env, seed=seed, record_history=record_history)
     
-    return agents
\ No newline at end of file
+    return agents
+
+def baseline_agent_names() -> List[str]:
+    """Names of the get_baseline_agents entries, in the same order, without building any agents"""
+    return list(STANDARDIZED_AGENT_FACTORIES) + ['skeleton_optimization']
+
+def create_baseline_agent(name: str, env, seed: Optional[int] = None,
+                          record_history: bool = True) -> BaselineAgent:
+    """Build one baseline agent by its get_baseline_agents name"""
+    if name == 'skeleton_optimization':
+        return create_skeleton_optimization_agent(env, seed=seed, record_history=record_history)
+    return STANDARDIZED_AGENT_FACTORIES[name](env)
\ No newline at end of file
@@ -9,8 +9,14 @@ It uses a controlled order environment to ensure meaningful optimization choices
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import copy
+from collections import deque
 from .standardized_agents import BaselineAgent
 
+try:
+    from ..environment.warehouse_env import NO_LAYOUT_SWAP
+except ImportError:
+    from environment.warehouse_env import NO_LAYOUT_SWAP
+
 class ControlledOrderGenerator:
     """Simplified order generator for multi-objective demo"""
     
@@ -58,6 +64,8 @@ class MultiObjectiveAgent(BaselineAgent):
     Agent that demonstrates multi-objective optimization tradeoffs
     """
     
+    METRICS_WINDOW = 500  # Timesteps kept for performance metrics
+    
     def __init__(self, env, profit_weight: float = 0.5, service_weight: float = 0.5):
         super().__init__(env)
         self.name = f"MultiObjective_P{profit_weight:.1f}_S{service_weight:.1f}"
@@ -67,10 +75,14 @@ class MultiObjectiveAgent(BaselineAgent):
         self.profit_weight = profit_weight / total_weight
         self.service_weight = service_weight / total_weight
         
-        # Performance tracking
-        self.timestep_profits = []
-        self.timestep_service_rates = []
-        self.objective_scores = []
+        # Performance tracking (bounded to the metrics window)
+        self.timestep_profits = deque(maxlen=self.METRICS_WINDOW)
+        self.timestep_service_rates = deque(maxlen=self.METRICS_WINDOW)
+        self.objective_scores = deque(maxlen=self.METRICS_WINDOW)
+        # Running sums over the window so averages are O(1) to query
+        self._profit_sum = 0.0
+        self._service_sum = 0.0
+        self._objective_sum = 0.0
         
         # Decision parameters
         self.optimal_employee_ratio = 2.5  # orders per employee
@@ -82,9 +94,12 @@ class MultiObjectiveAgent(BaselineAgent):
     def reset(self):
         """Reset agent state"""
         super().reset()
-        self.timestep_profits = []
-        self.timestep_service_rates = []
-        self.objective_scores = []
+        self.timestep_profits.clear()
+        self.timestep_service_rates.clear()
+        self.objective_scores.clear()
+        self._profit_sum = 0.0
+        self._service_sum = 0.0
+        self._objective_sum = 0.0
         
     def get_action(self, observation: Dict) -> Dict:
         """Generate action optimizing weighted objectives"""
@@ -100,8 +115,9 @@ class MultiObjectiveAgent(BaselineAgent):
         current_time = observation['time'][0]
         
         current_profit = financial[0]
-        current_queue_length = np.sum(queue_info[:, 0] > 0)  # Count non-empty orders
-        num_employees = np.sum(employee_info[:, 0] > 0)  # Count active employees
+        # Both columns are non-negative, so counting nonzeros matches "> 0" without a mask temp
+        current_queue_length = np.count_nonzero(queue_info[:, 0])  # Count non-empty orders
+        num_employees = np.count_nonzero(employee_info[:, 0])  # Count active employees
         
         # Calculate current service quality (completion rate proxy)
         workload_ratio = current_queue_length / max(1, num_employees)
@@ -116,18 +132,31 @@ class MultiObjectiveAgent(BaselineAgent):
             'order_assignments': self._get_priority_assignments(queue_info, employee_info)
         }
         
-        # Track performance
-        self.timestep_profits.append(current_profit)
-        self.timestep_service_rates.append(estimated_service_rate)
-        
         # Calculate combined objective score
         normalized_profit = max(-1, min(1, current_profit / 500))  # Normalize to [-1, 1]
         objective_score = (self.profit_weight * normalized_profit + 
                           self.service_weight * estimated_service_rate)
-        self.objective_scores.append(objective_score)
+        
+        # Track performance
+        self._record_metrics(float(current_profit), estimated_service_rate, objective_score)
         
         return action
     
+    def _record_metrics(self, profit: float, service_rate: float, objective_score: float):
+        """Append one timestep to the metric windows, keeping the running sums in step"""
+        # The three windows always have equal length, so they evict together
+        if len(self.timestep_profits) == self.METRICS_WINDOW:
+            self._profit_sum -= self.timestep_profits[0]
+            self._service_sum -= self.timestep_service_rates[0]
+            self._objective_sum -= self.objective_scores[0]
+        
+        self.timestep_profits.append(profit)
+        self.timestep_service_rates.append(service_rate)
+        self.objective_scores.append(objective_score)
+        self._profit_sum += profit
+        self._service_sum += service_rate
+        self._objective_sum += objective_score
+    
     def _get_multi_objective_staffing(self, current_profit: float, workload_ratio: float, 
                                     num_employees: int, service_rate: float) -> int:
         """Staffing decisions balancing profit vs service with wage choices"""
@@ -173,7 +202,7 @@ class MultiObjectiveAgent(BaselineAgent):
         
         # Service-focused: only optimize when not busy
         if self.service_weight > 0.6 and workload_ratio > 2.5:
-            return [0, 0]  # Don't disrupt operations when busy
+            return NO_LAYOUT_SWAP  # Don't disrupt operations when busy
         
         # Profit-focused: optimize more aggressively for long-term gains
         if self.profit_weight > 0.6:
@@ -184,21 +213,21 @@ class MultiObjectiveAgent(BaselineAgent):
         if current_time % optimization_frequency == 0 and np.random.random() < 0.3:
             grid_size = self.env.grid_width * self.env.grid_height
             # Focus on moving popular items (first 20% of item types) to better positions
-            popular_positions = list(range(grid_size // 4))  # First quarter of grid
-            other_positions = list(range(grid_size // 4, grid_size))
-            
-            pos1 = np.random.choice(popular_positions)
-            pos2 = np.random.choice(other_positions)
+            # Draw from the first quarter of the grid and from the rest by offset, without
+            # materialising either index range (same draws as choosing from the lists)
+            quarter = grid_size // 4
+            pos1 = np.random.choice(quarter)
+            pos2 = quarter + np.random.choice(grid_size - quarter)
             return [pos1, pos2]
         
-        return [0, 0]
+        return NO_LAYOUT_SWAP
     
     def _get_priority_assignments(self, queue_info: np.ndarray, employee_info: np.ndarray) -> List[int]:
         """Order assignment based on objective priorities"""
         
         assignments = [0] * 20
         
-        num_employees = int(np.sum(employee_info[:, 0] > 0))
+        num_employees = np.count_nonzero(employee_info[:, 0])
         active_orders = queue_info[queue_info[:, 0] > 0]  # Non-empty orders
         
         if num_employees == 0 or len(active_orders) == 0:
@@ -236,15 +265,15 @@ class MultiObjectiveAgent(BaselineAgent):
             }
         
         return {
-            'avg_profit': np.mean(self.timestep_profits[-500:]),  # Last 500 timesteps
-            'avg_service_rate': np.mean(self.timestep_service_rates[-500:]),
-            'avg_objective_score': np.mean(self.objective_scores[-500:]),
+            'avg_profit': self._profit_sum / len(self.timestep_profits),  # Last METRICS_WINDOW timesteps
+            'avg_service_rate': self._service_sum / len(self.timestep_service_rates),
+            'avg_objective_score': self._objective_sum / len(self.objective_scores),
             'final_profit': self.timestep_profits[-1] if self.timestep_profits else 0,
             'final_service_rate': self.timestep_service_rates[-1] if self.timestep_service_rates else 0,
             'profit_weight': self.profit_weight,
             'service_weight': self.service_weight,
-            'profit_std': np.std(self.timestep_profits[-500:]) if len(self.timestep_profits) > 10 else 0,
-            'service_std': np.std(self.timestep_service_rates[-500:]) if len(self.timestep_service_rates) > 10 else 0
+            'profit_std': np.std(self.timestep_profits) if len(self.timestep_profits) > 10 else 0,
+            'service_std': np.std(self.timestep_service_rates) if len(self.timestep_service_rates) > 10 else 0
         }
 
 class WageStrategyAgent(MultiObjectiveAgent):
@@ -15,9 +15,54 @@ Students should replace the naive methods with proper optimization algorithms.
 """
 
 import numpy as np
+from collections import deque
 from typing import Dict, Optional
 from .standardized_agents import BaselineAgent
 
+try:
+    from ..environment.grid_scan_numba import njit
+except ImportError:
+    from environment.grid_scan_numba import njit
+
+
+# Naive policy kernels for CompiledSkeletonOptimizationAgent - compiled when numba is
+# available. Each takes plain arrays plus the same three pre-sampled uniforms as its hook.
+
+@njit(cache=True)
+def naive_staffing(num_employees, has_manager, u):
+    """Random staffing decision from three uniform draws"""
+    if u[0] < 0.3:  # 30% chance to hire
+        if num_employees < 20:  # Don't go completely overboard
+            return 1  # Hire worker
+    elif u[1] < 0.1:  # 10% chance to fire
+        if num_employees > 1:  # Don't fire everyone
+            return 2  # Fire worker
+    elif u[2] < 0.2:  # 20% chance to hire manager (increased from 5%)
+        if not has_manager or num_employees > 10:  # Hire manager if we don't have one, or if we have lots of workers
+            return 3  # Hire manager
+    return 0  # No action
+
+
+@njit(cache=True)
+def naive_layout(current_timestep, grid_size, u, layout_out):
+    """Occasional random swap written into layout_out"""
+    if current_timestep % 100 == 0 and u[0] < 0.2:  # Random timing
+        # Pick two random positions to swap
+        layout_out[0] = int(u[1] * grid_size)
+        layout_out[1] = int(u[2] * grid_size)
+    else:
+        layout_out[0] = 0  # No swap
+        layout_out[1] = 0
+
+
+@njit(cache=True)
+def naive_order_assignments(num_employees, u, assignments_out):
+    """Randomly assign the first few orders to the first few employees"""
+    assignments_out[:] = 0  # No assignments by default
+    for i in range(min(3, num_employees)):  # Only assign 3 orders max
+        if u[i] < 0.6:  # 60% chance to assign
+            assignments_out[i] = (i % num_employees) + 1  # Random employee
+
 class SkeletonOptimizationAgent(BaselineAgent):
     """
     Template for students to implement their own optimization algorithms.
@@ -29,7 +74,12 @@ class SkeletonOptimizationAgent(BaselineAgent):
     - Multi-objective optimization techniques
     """
     
-    def __init__(self, env):
+    # Pre-sampled random draws (refilled when exhausted)
+    UNIFORM_BUFFER_SIZE = 100_000
+    GAUSSIAN_BUFFER_SIZE = 10_000
+    HISTORY_LIMIT = 10_000  # Most recent actions/rewards kept in the histories
+    
+    def __init__(self, env, seed: Optional[int] = None, record_history: bool = True):
         super().__init__(env)
         self.name = "StudentOptimization"
         
@@ -51,10 +101,52 @@ class SkeletonOptimizationAgent(BaselineAgent):
         # Students can implement adaptive parameters that change based on performance
         self.adaptive_optimization_enabled = False
         
+        # Buffers the default hooks refill every step (the env reads them before the next call)
+        self._layout_buf = np.zeros(2, dtype=np.int32)
+        self._assign_buf = np.zeros(20, dtype=np.int32)
+        self._action = {
+            'staffing_action': 0,
+            'layout_swap': self._layout_buf,
+            'order_assignments': self._assign_buf
+        }
+        self.record_history = record_history  # Keep action/reward histories (benchmark/training workers turn it off)
+        self.last_action = None  # Most recent action, kept regardless of record_history
+        
+        # Per-agent PCG64 generator; draws are sampled in bulk instead of one scalar call per decision
+        self.rng = np.random.default_rng(seed)
+        self._refill_uniform()
+        self._refill_gaussian()
+        
+    def _refill_uniform(self):
+        """Pre-sample a block of uniform [0, 1) draws"""
+        self._u = self.rng.random(self.UNIFORM_BUFFER_SIZE)
+        self._i = 0
+    
+    def _refill_gaussian(self):
+        """Pre-sample blocks of standard normal vectors for weight updates"""
+        self._g4 = self.rng.standard_normal((self.GAUSSIAN_BUFFER_SIZE, 4))
+        self._g3 = self.rng.standard_normal((self.GAUSSIAN_BUFFER_SIZE, 3))
+        self._j = 0
+    
+    def _take_uniforms(self, count: int) -> np.ndarray:
+        """View of the next `count` pre-sampled uniform draws"""
+        if self._i + count > self.UNIFORM_BUFFER_SIZE:
+            self._refill_uniform()
+        values = self._u[self._i:self._i + count]
+        self._i += count
+        return values
+    
     def reset(self):
         """Reset agent state - students should expand this"""
-        self.action_history = []
-        self.reward_history = []
+        self.action_history = deque(maxlen=self.HISTORY_LIMIT)
+        self.reward_history = deque(maxlen=self.HISTORY_LIMIT)
+        self._step = 0  # Rewards recorded this episode
+        self._num_actions = 0  # Actions taken this episode
+        # Rolling reward windows with running sums for O(1) metrics
+        self._r100 = deque(maxlen=100)
+        self._s100 = 0.0
+        self._r10 = deque(maxlen=10)
+        self._s10 = 0.0
         # TODO: Reset any neural network states, replay buffers, etc.
     
     def get_action(self, observation: Dict) -> Dict:
@@ -69,14 +161,21 @@ class SkeletonOptimizationAgent(BaselineAgent):
         queue_info = observation['order_queue']
         employee_info = observation['employees']
         
-        action = {
-            'staffing_action': self._get_naive_staffing_action(financial_state, employee_info),
-            'layout_swap': self._get_naive_layout_action(current_timestep),
-            'order_assignments': self._get_naive_order_assignments(queue_info, employee_info)
-        }
+        action = self._action
+        action['staffing_action'] = self._get_naive_staffing_action(financial_state, employee_info)
+        action['layout_swap'] = self._get_naive_layout_action(current_timestep)
+        action['order_assignments'] = self._get_naive_order_assignments(queue_info, employee_info)
         
         # TODO: Students should implement proper action recording for optimization
-        self.action_history.append(action.copy())
+        self._num_actions += 1
+        self.last_action = action
+        if self.record_history:
+            # Copy the values out - the default hooks refill the same buffers every step
+            self.action_history.append({
+                'staffing_action': action['staffing_action'],
+                'layout_swap': list(action['layout_swap']),
+                'order_assignments': list(action['order_assignments'])
+            })
         
         return action
     
@@ -94,25 +193,26 @@ class SkeletonOptimizationAgent(BaselineAgent):
         # Current approach: Make random decisions based on "vibes"
         
         current_profit = financial_state[0]
-        num_employees = np.sum(employee_info[:, 0] > 0)  # Count active employees
+        num_employees = self.env.num_active_employees  # Count active employees
         
         # Terrible logic: Random decisions with slight bias
         # BUT: Hire managers more frequently so layout optimization can work
         has_manager = np.any(employee_info[:, 5] == 1)  # Check if we have a manager
+        u = self._take_uniforms(3)
         
-        if np.random.random() < 0.3:  # 30% chance to hire
+        if u[0] < 0.3:  # 30% chance to hire
             if num_employees < 20:  # Don't go completely overboard
                 return 1  # Hire worker
-        elif np.random.random() < 0.1:  # 10% chance to fire
+        elif u[1] < 0.1:  # 10% chance to fire
             if num_employees > 1:  # Don't fire everyone
                 return 2  # Fire worker
-        elif np.random.random() < 0.2:  # 20% chance to hire manager (increased from 5%)
+        elif u[2] < 0.2:  # 20% chance to hire manager (increased from 5%)
             if not has_manager or num_employees > 10:  # Hire manager if we don't have one, or if we have lots of workers
                 return 3  # Hire manager
         
         return 0  # No action
     
-    def _get_naive_layout_action(self, current_timestep) -> list:
+    def _get_naive_layout_action(self, current_timestep) -> np.ndarray:
         """
         WEEK 1 STEP 1: Layout optimization - students should improve this!
         
@@ -126,16 +226,18 @@ class SkeletonOptimizationAgent(BaselineAgent):
         # TODO WEEK 1 STEP 1: Students should implement intelligent layout optimization
         # Current approach: Occasionally make random swaps
         
-        if current_timestep % 100 == 0 and np.random.random() < 0.2:  # Random timing
+        u = self._take_uniforms(3)
+        if current_timestep % 100 == 0 and u[0] < 0.2:  # Random timing
             # Pick two random positions to swap
             grid_size = self.env.grid_width * self.env.grid_height
-            pos1 = np.random.randint(0, grid_size)
-            pos2 = np.random.randint(0, grid_size)
-            return [pos1, pos2]
+            self._layout_buf[0] = int(u[1] * grid_size)
+            self._layout_buf[1] = int(u[2] * grid_size)
+        else:
+            self._layout_buf.fill(0)  # No swap
         
-        return [0, 0]  # No swap
+        return self._layout_buf
     
-    def _get_naive_order_assignments(self, queue_info, employee_info) -> list:
+    def _get_naive_order_assignments(self, queue_info, employee_info) -> np.ndarray:
         """
         WEEK 2 STEP 2: Order assignment - students should improve this!
         
@@ -149,16 +251,18 @@ class SkeletonOptimizationAgent(BaselineAgent):
         # TODO WEEK 2 STEP 2: Students should implement intelligent order assignment
         # Current approach: Random assignments
         
-        assignments = [0] * 20  # No assignments by default
+        # Fills a reused int32 buffer - the env only reads it, callers must not keep it across steps
+        assignments = self._assign_buf
+        assignments.fill(0)  # No assignments by default
         
-        # Count how many employees we have (very naive)
-        num_employees = int(np.sum(employee_info[:, 0] > 0))
+        # Count how many employees we have
+        num_employees = self.env.num_active_employees
+        u = self._take_uniforms(3)
         
         # Randomly assign first few orders to first few employees
-        if num_employees > 0:
-            for i in range(min(3, num_employees)):  # Only assign 3 orders max
-                if np.random.random() < 0.6:  # 60% chance to assign
-                    assignments[i] = (i % num_employees) + 1  # Random employee
+        for i in range(min(3, num_employees)):  # Only assign 3 orders max
+            if u[i] < 0.6:  # 60% chance to assign
+                assignments[i] = (i % num_employees) + 1  # Random employee
         
         return assignments
     
@@ -172,14 +276,27 @@ class SkeletonOptimizationAgent(BaselineAgent):
         - Adaptive parameter adjustment
         - Multi-objective optimization
         """
-        self.reward_history.append(reward)
+        if self.record_history:
+            self.reward_history.append(reward)
+        self._step += 1
+        if len(self._r100) == self._r100.maxlen:
+            self._s100 -= self._r100[0]
+        self._r100.append(reward)
+        self._s100 += reward
+        if len(self._r10) == self._r10.maxlen:
+            self._s10 -= self._r10[0]
+        self._r10.append(reward)
+        self._s10 += reward
         
         # Skeleton optimization - doesn't actually learn anything useful
-        if len(self.reward_history) > 10:
+        if self._step > 10:
             # "Update" weights randomly (this doesn't actually improve performance)
             if reward > 0:
-                self.staffing_weights += np.random.randn(4) * 0.01
-                self.layout_weights += np.random.randn(3) * 0.01
+                if self._j >= self.GAUSSIAN_BUFFER_SIZE:
+                    self._refill_gaussian()
+                self.staffing_weights += self._g4[self._j] * 0.01
+                self.layout_weights += self._g3[self._j] * 0.01
+                self._j += 1
     
     def should_update_policy(self) -> bool:
         """
@@ -187,27 +304,50 @@ class SkeletonOptimizationAgent(BaselineAgent):
         
         TODO WEEK 3 STEP 2: Students should implement proper update schedules
         """
-        return len(self.action_history) % 50 == 0  # Arbitrary update frequency
+        return self._step % 50 == 0  # Arbitrary update frequency
     
     def get_performance_metrics(self) -> Dict:
         """
         Get agent performance metrics for analysis
         Students can use this to debug their improvements
         """
-        if not self.reward_history:
+        if self._step == 0:
             return {"avg_reward": 0, "total_actions": 0}
         
         return {
-            "avg_reward": np.mean(self.reward_history[-100:]),  # Last 100 rewards
-            "total_actions": len(self.action_history),
+            "avg_reward": self._s100 / len(self._r100),  # Last 100 rewards
+            "total_actions": self._num_actions,
             "exploration_rate": self.exploration_rate,
-            "recent_performance": np.mean(self.reward_history[-10:]) if len(self.reward_history) >= 10 else 0
+            "recent_performance": self._s10 / len(self._r10) if len(self._r10) == self._r10.maxlen else 0
         }
 
 
-def create_skeleton_optimization_agent(env) -> SkeletonOptimizationAgent:
+def create_skeleton_optimization_agent(env, seed: Optional[int] = None,
+                                       record_history: bool = True) -> SkeletonOptimizationAgent:
     """Factory function to create skeleton Optimization agent"""
-    return SkeletonOptimizationAgent(env)
+    return SkeletonOptimizationAgent(env, seed=seed, record_history=record_history)
+
+
+class CompiledSkeletonOptimizationAgent(SkeletonOptimizationAgent):
+    """
+    The unmodified naive policy with its three hooks run as compiled kernels.
+    
+    Makes the same decisions as SkeletonOptimizationAgent for the same seed, so it can
+    stand in as a fast naive reference. Students should edit SkeletonOptimizationAgent instead.
+    """
+    
+    def _get_naive_staffing_action(self, financial_state, employee_info) -> int:
+        has_manager = bool(np.any(employee_info[:, 5] == 1))
+        return int(naive_staffing(self.env.num_active_employees, has_manager, self._take_uniforms(3)))
+    
+    def _get_naive_layout_action(self, current_timestep) -> np.ndarray:
+        grid_size = self.env.grid_width * self.env.grid_height
+        naive_layout(int(current_timestep), grid_size, self._take_uniforms(3), self._layout_buf)
+        return self._layout_buf
+    
+    def _get_naive_order_assignments(self, queue_info, employee_info) -> np.ndarray:
+        naive_order_assignments(self.env.num_active_employees, self._take_uniforms(3), self._assign_buf)
+        return self._assign_buf
 
 
 # TODO: Students should implement these advanced components:
@@ -224,8 +364,8 @@ class StudentOptimizationAgent(SkeletonOptimizationAgent):
     5. Add proper exploration vs exploitation balance
     """
     
-    def __init__(self, env):
-        super().__init__(env)
+    def __init__(self, env, seed: Optional[int] = None, record_history: bool = True):
+        super().__init__(env, seed=seed, record_history=record_history)
         self.name = "StudentOptimization"
         
         # TODO: Students implement these
@@ -7,6 +7,32 @@ This provides a clean foundation for RL to learn optimal parameter combinations.
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+
+try:
+    from ..environment.warehouse_env import NO_LAYOUT_SWAP
+except ImportError:
+    from environment.warehouse_env import NO_LAYOUT_SWAP
+
+
+def _item_locator(grid):
+    """Memoized grid.find_item_locations; create one per decision, as the cache assumes a fixed layout"""
+    cache = {}
+    
+    def locate(item_type):
+        locations = cache.get(item_type)
+        if locations is None:
+            locations = cache[item_type] = grid.find_item_locations(item_type)
+        return locations
+    
+    return locate
+
+
+def _swap_key(pos1_idx, pos2_idx):
+    """Order-independent key for a swap between two flat grid indices"""
+    return (pos1_idx, pos2_idx) if pos1_idx < pos2_idx else (pos2_idx, pos1_idx)
+
 
 class BaselineAgent(ABC):
     """Base class for baseline heuristic agents"""
@@ -86,8 +112,8 @@ class StandardizedAgent(BaselineAgent):
         self.name = name
         self.params = params
         
-        # Internal state tracking
-        self.profit_history = []
+        # Internal state tracking (profit trend window, oldest entries evicted automatically)
+        self.profit_history = deque(maxlen=params.profit_tracking_window)
         self.last_major_decision = 0
         self.last_layout_optimization = 0
         self.has_manager = False
@@ -109,7 +135,7 @@ class StandardizedAgent(BaselineAgent):
     
     def reset(self):
         """Reset agent state between episodes"""
-        self.profit_history = []
+        self.profit_history.clear()
         self.last_major_decision = 0
         self.last_layout_optimization = 0
         self.has_manager = False
@@ -121,42 +147,44 @@ class StandardizedAgent(BaselineAgent):
         self.last_cooccurrence_optimization = 0
     
     def get_action(self, observation: Dict) -> Dict:
-        action = {
-            'staffing_action': 0,
-            'layout_swap': [0, 0],
-            'order_assignments': [0] * 20
-        }
+        staffing_action = 0
+        layout_swap = NO_LAYOUT_SWAP
         
         current_time = self.env.current_timestep
         
         # Make major decisions at intervals
         if current_time - self.last_major_decision >= self.params.decision_interval:
-            action['staffing_action'] = self._get_staffing_action()
+            staffing_action = self._get_staffing_action()
             self.last_major_decision = current_time
         
         # Handle simplified layout optimization
         if current_time - self.last_layout_optimization >= self.params.layout_optimization_interval:
             layout_action = self._get_simple_layout_action(current_time)
             if layout_action:
-                action['layout_swap'] = layout_action
+                layout_swap = layout_action
                 self.last_layout_optimization = current_time
                 # Record the swap with simple tracking
                 self._record_swap_execution(layout_action[0], layout_action[1], current_time)
         
-        # Handle order assignments
-        action['order_assignments'] = self._get_order_assignments()
-        
-        return action
+        # Handle order assignments (the action dict is built once, with its final values)
+        return {
+            'staffing_action': staffing_action,
+            'layout_swap': layout_swap,
+            'order_assignments': self._get_order_assignments()
+        }
     
     def _get_staffing_action(self) -> int:
         """Determine staffing action based on hiring strategy"""
         queue_length = len(self.env.order_queue.orders)
         num_employees = len(self.env.employees)
-        num_workers = sum(1 for emp in self.env.employees if not emp.is_manager)
         current_profit = self.env.cumulative_profit
         
+        # Worker count and manager status from the env's per-step employee array
+        num_managers = int(np.count_nonzero(self.env.employee_array['is_manager']))
+        num_workers = num_employees - num_managers
+        
         # Update manager status
-        self.has_manager = any(emp.is_manager for emp in self.env.employees)
+        self.has_manager = num_managers > 0
         
         if self.params.hiring_strategy == "greedy":
             # Hire as fast as possible
@@ -194,11 +222,14 @@ class StandardizedAgent(BaselineAgent):
         elif self.params.hiring_strategy == "sustained_profit":
             # Track profit trends for sustained profitability
             self.profit_history.append(current_profit)
-            if len(self.profit_history) > self.params.profit_tracking_window:
-                self.profit_history.pop(0)
             
-            if len(self.profit_history) >= 3:
-                recent_trend = np.mean(self.profit_history[-3:]) - np.mean(self.profit_history[-6:-3])
+            history_len = len(self.profit_history)
+            if history_len >= 3:
+                # Last three entries vs the (up to) three before them, without copying the window
+                recent = np.fromiter(islice(self.profit_history, history_len - 3, None), dtype=np.float64)
+                previous = np.fromiter(islice(self.profit_history, max(0, history_len - 6), history_len - 3),
+                                       dtype=np.float64)
+                recent_trend = np.mean(recent) - np.mean(previous)
                 
                 if (recent_trend > 0 and queue_length > num_employees * self.params.hire_threshold_ratio and
                     num_employees < self.params.max_employees_strategy):
@@ -350,7 +381,7 @@ class StandardizedAgent(BaselineAgent):
     def record_swap_execution(self, pos1_idx: int, pos2_idx: int):
         """Record that a swap was executed to start its cooldown period"""
         current_time = self.env.current_timestep
-        swap_key = tuple(sorted([pos1_idx, pos2_idx]))
+        swap_key = _swap_key(pos1_idx, pos2_idx)
         self.recent_swaps[swap_key] = current_time
         pass  # Swap recorded
     
@@ -360,6 +391,8 @@ class StandardizedAgent(BaselineAgent):
         if not idle_workers or not orders:
             return assignments
         
+        locate = _item_locator(self.env.warehouse_grid)
+        
         # Calculate priority scores for each worker-order pair
         worker_order_scores = []
         
@@ -371,7 +404,7 @@ class StandardizedAgent(BaselineAgent):
                 # Find closest item needed for this order
                 min_distance = float('inf')
                 for item_type in order.items:
-                    item_locations = self.env.warehouse_grid.find_item_locations(item_type)
+                    item_locations = locate(item_type)
                     for item_pos in item_locations:
                         distance = self.env.warehouse_grid.manhattan_distance(worker_pos, item_pos)
                         min_distance = min(min_distance, distance)
@@ -413,6 +446,8 @@ class StandardizedAgent(BaselineAgent):
         if not idle_workers or not orders:
             return assignments
         
+        locate = _item_locator(self.env.warehouse_grid)
+        
         # Calculate distances for each worker-order pair
         worker_order_distances = []
         
@@ -424,7 +459,7 @@ class StandardizedAgent(BaselineAgent):
                 # Find closest item needed for this order
                 min_distance = float('inf')
                 for item_type in order.items:
-                    item_locations = self.env.warehouse_grid.find_item_locations(item_type)
+                    item_locations = locate(item_type)
                     for item_pos in item_locations:
                         distance = self.env.warehouse_grid.manhattan_distance(worker_pos, item_pos)
                         min_distance = min(min_distance, distance)
@@ -453,10 +488,9 @@ class StandardizedAgent(BaselineAgent):
             from environment.employee import EmployeeState
         
         # Find idle workers (not managers)
-        idle_workers = []
-        for i, employee in enumerate(self.env.employees):
-            if employee.state == EmployeeState.IDLE and not employee.is_manager:
-                idle_workers.append(i)
+        employees = self.env.employee_array
+        idle_workers = np.flatnonzero(
+            (employees['state'] == EmployeeState.IDLE.value) & ~employees['is_manager']).tolist()
         
         orders = self.env.order_queue.orders[:20]  # Limit to action space size
         assignments = [0] * 20
@@ -504,9 +538,10 @@ class StandardizedAgent(BaselineAgent):
         if queue_length > num_employees * self.params.layout_queue_condition_ratio:
             return None
         
-        # Need a manager for layout optimization
-        manager = next((emp for emp in self.env.employees if emp.is_manager), None)
-        if not manager:
+        # Need a manager for layout optimization (presence and state from the same snapshot)
+        employees = self.env.employee_array
+        managers = np.flatnonzero(employees['is_manager'])
+        if managers.size == 0:
             return None
         
         try:
@@ -514,7 +549,7 @@ class StandardizedAgent(BaselineAgent):
         except ImportError:
             from environment.employee import EmployeeState
             
-        if manager.state != EmployeeState.IDLE:
+        if employees['state'][managers[0]] != EmployeeState.IDLE.value:
             return None
         
         # Check cooldown
@@ -536,7 +571,7 @@ class StandardizedAgent(BaselineAgent):
         # Check cooldown before returning
         if proposed_swap:
             pos1_idx, pos2_idx = proposed_swap
-            swap_key = tuple(sorted([pos1_idx, pos2_idx]))
+            swap_key = _swap_key(pos1_idx, pos2_idx)
             
             if swap_key in self.recent_swaps:
                 last_swap_time = self.recent_swaps[swap_key]
@@ -557,25 +592,23 @@ class StandardizedAgent(BaselineAgent):
         if freq_array.max() == 0:
             return None
         
-        # Find hot items that we haven't moved yet
-        hot_items = []
-        for item_type in range(len(freq_array)):
-            if freq_array[item_type] > 0 and item_type not in self.moved_hot_items:
-                item_locs = grid.find_item_locations(item_type)
-                if item_locs:
-                    hot_items.append((item_type, freq_array[item_type], item_locs[0]))
-        
-        if not hot_items:
-            return None
-        
-        # Sort by frequency (highest first)
-        hot_items.sort(key=lambda x: x[1], reverse=True)
+        # Hot items by frequency (highest first); the stable sort keeps item order on ties
+        hot_items = np.flatnonzero(freq_array > 0)
+        hot_items = hot_items[np.argsort(-freq_array[hot_items], kind='stable')]
         
         # Get delivery positions (truck bays)
         delivery_positions = getattr(grid, 'truck_bay_positions', [(grid.width//2, grid.height//2)])
         
-        # Find the hottest item that's far from delivery
-        for item_type, _, item_pos in hot_items:
+        # Find the hottest item we haven't moved yet that's far from delivery,
+        # locating items only as the scan reaches them
+        for item_type in hot_items.tolist():
+            if item_type in self.moved_hot_items:
+                continue
+            item_locs = grid.find_item_locations(item_type)
+            if not item_locs:
+                continue
+            item_pos = item_locs[0]
+            
             # Calculate distance to nearest delivery spot
             min_delivery_dist = min(grid.manhattan_distance(item_pos, delivery_pos) 
                                   for delivery_pos in delivery_positions)
@@ -600,81 +633,74 @@ class StandardizedAgent(BaselineAgent):
         
         current_idx = current_pos[1] * grid.width + current_pos[0]
         
+        # Gather all storage positions at once
+        xs, ys = grid.storage_xy[:, 0], grid.storage_xy[:, 1]
+        delivery = np.asarray(delivery_positions)
+        
+        # Calculate distance to delivery
+        candidate_dist = (np.abs(xs[:, None] - delivery[:, 0]) +
+                          np.abs(ys[:, None] - delivery[:, 1])).min(axis=1)
+        
+        # Only consider positions that are closer
+        improvement = current_dist - candidate_dist
+        
         # Look for empty spots or spots with cold items closer to delivery
-        best_swap = None
-        best_improvement = 0
+        existing_items = grid.item_grid[ys, xs]
+        candidates = existing_items == -1  # Empty spot - perfect for swapping
+        if hasattr(grid, 'item_access_frequency'):
+            # Occupied spot - only swap with cold items
+            freq_array = grid.item_access_frequency
+            in_range = (existing_items >= 0) & (existing_items < len(freq_array))
+            cold = np.zeros_like(candidates)
+            cold[in_range] = freq_array[existing_items[in_range]] == 0
+            candidates |= cold
+        candidates &= improvement > 1  # Need at least 2 step improvement
         
-        # Check all storage positions
-        for y in range(grid.height):
-            for x in range(grid.width):
-                if grid.cell_types[y, x] != 1:  # CellType.STORAGE.value = 1
-                    continue
-                
-                # Calculate distance to delivery
-                candidate_dist = min(grid.manhattan_distance((x, y), delivery_pos) 
-                                   for delivery_pos in delivery_positions)
-                
-                # Only consider positions that are closer
-                improvement = current_dist - candidate_dist
-                if improvement <= 1:  # Need at least 2 step improvement
-                    continue
-                
-                # Check what's at this position
-                existing_item = grid.get_item_at_position(x, y)
-                
-                if existing_item is None:
-                    # Empty spot - perfect for swapping
-                    if improvement > best_improvement:
-                        best_improvement = improvement
-                        candidate_idx = y * grid.width + x
-                        best_swap = [current_idx, candidate_idx]
-                
-                elif hasattr(grid, 'item_access_frequency'):
-                    # Occupied spot - only swap with cold items
-                    freq_array = grid.item_access_frequency
-                    if existing_item < len(freq_array) and freq_array[existing_item] == 0:
-                        # Cold item - good candidate for swapping
-                        if improvement > best_improvement:
-                            best_improvement = improvement
-                            candidate_idx = y * grid.width + x
-                            best_swap = [current_idx, candidate_idx]
+        if not candidates.any():
+            return None
         
-        return best_swap
+        # First (row-major) position with the largest improvement
+        best = int(np.argmax(np.where(candidates, improvement, 0)))
+        candidate_idx = int(ys[best]) * grid.width + int(xs[best])
+        return [current_idx, candidate_idx]
     
     def _find_cooccurrence_swap(self, current_time: int) -> Optional[List[int]]:
         """Group items that co-occur frequently to be close together"""
         grid = self.env.warehouse_grid
         cooccurrence = grid.item_cooccurrence
         
-        if cooccurrence.max() == 0:
+        if cooccurrence.max() <= 2:  # No pair clears the count > 2 threshold
             return None
         
         best_swap = None
         best_benefit = 0
         
+        # Pairs (item1 < item2) frequently ordered together, in row-major order
+        pairs = np.argwhere(np.triu(cooccurrence > 2, k=1))
+        counts = cooccurrence[pairs[:, 0], pairs[:, 1]]
+        
+        # Only each item's first location is used, so take them all from one grid sweep
+        first_loc = [tuple(loc) for loc in grid.first_item_locations().tolist()]
+        
         # Find pairs with high co-occurrence that are far apart
-        for item1 in range(grid.num_item_types):
-            for item2 in range(item1 + 1, grid.num_item_types):
-                cooccur_count = cooccurrence[item1, item2]
+        for (item1, item2), cooccur_count in zip(pairs.tolist(), counts.tolist()):
+            pos1 = first_loc[item1]
+            pos2 = first_loc[item2]
+            
+            if pos1[0] >= 0 and pos2[0] >= 0:
+                current_distance = grid.manhattan_distance(pos1, pos2)
                 
-                if cooccur_count > 2:  # Frequently ordered together
-                    item1_locs = grid.find_item_locations(item1)
-                    item2_locs = grid.find_item_locations(item2)
-                    
-                    if item1_locs and item2_locs:
-                        current_distance = grid.manhattan_distance(item1_locs[0], item2_locs[0])
-                        
-                        # Only optimize if they're far apart (distance > 3)
-                        if current_distance <= 3:
-                            continue
-                        
-                        # Find a way to bring them closer
-                        swap = self._find_grouping_swap(grid, item1_locs[0], item2_locs[0], item1, item2)
-                        if swap:
-                            benefit = cooccur_count * (current_distance - 2)  # Assume we can get them 2 apart
-                            if benefit > best_benefit:
-                                best_benefit = benefit
-                                best_swap = swap
+                # Only optimize if they're far apart (distance > 3)
+                if current_distance <= 3:
+                    continue
+                
+                # Find a way to bring them closer
+                swap = self._find_grouping_swap(grid, pos1, pos2, item1, item2)
+                if swap:
+                    benefit = cooccur_count * (current_distance - 2)  # Assume we can get them 2 apart
+                    if benefit > best_benefit:
+                        best_benefit = benefit
+                        best_swap = swap
         
         return best_swap
     
@@ -708,7 +734,7 @@ class StandardizedAgent(BaselineAgent):
     
     def _record_swap_execution(self, pos1_idx: int, pos2_idx: int, current_time: int):
         """Simple swap execution recording"""
-        swap_key = tuple(sorted([pos1_idx, pos2_idx]))
+        swap_key = _swap_key(pos1_idx, pos2_idx)
         self.recent_swaps[swap_key] = current_time
     
     def _update_swap_performance_metrics(self, current_time: int):
@@ -935,7 +961,7 @@ class StandardizedAgent(BaselineAgent):
     def record_swap_execution_enhanced(self, pos1_idx: int, pos2_idx: int, current_time: int):
         """Enhanced swap execution recording with performance tracking setup"""
         # Record for cooldown tracking (existing functionality)
-        swap_key = tuple(sorted([pos1_idx, pos2_idx]))
+        swap_key = _swap_key(pos1_idx, pos2_idx)
         self.recent_swaps[swap_key] = current_time
         
         # Set up performance tracking for this swap
@@ -943,8 +969,8 @@ class StandardizedAgent(BaselineAgent):
         
         # Calculate predicted benefit (re-run the evaluation)
         grid = self.env.warehouse_grid
-        pos1_x, pos1_y = pos1_idx % grid.width, pos1_idx // grid.width
-        pos2_x, pos2_y = pos2_idx % grid.width, pos2_idx // grid.width
+        pos1_y, pos1_x = divmod(int(pos1_idx), grid.width)
+        pos2_y, pos2_x = divmod(int(pos2_idx), grid.width)
         
         # Estimate benefit based on current co-occurrence and frequency data
         item1 = grid.get_item_at_position(pos1_x, pos1_y)
@@ -1089,14 +1115,17 @@ def create_aggressive_swap_agent(env) -> StandardizedAgent:
     )
     return StandardizedAgent(env, params, "AggressiveSwap")
 
+# Agent name -> factory, in the order get_standardized_agents builds them
+STANDARDIZED_AGENT_FACTORIES = {
+    'greedy_std': create_greedy_agent,
+    'random_std': create_random_agent,
+    'fixed_std': create_fixed_hiring_agent,
+    'intelligent_hiring': create_intelligent_hiring_agent,
+    'intelligent_queue': create_intelligent_queue_agent,
+    'distance_based': create_distance_based_agent,
+    'aggressive_swap': create_aggressive_swap_agent
+}
+
 def get_standardized_agents(env) -> Dict[str, StandardizedAgent]:
     """Get all standardized agents"""
-    return {
-        'greedy_std': create_greedy_agent(env),
-        'random_std': create_random_agent(env),
-        'fixed_std': create_fixed_hiring_agent(env),
-        'intelligent_hiring': create_intelligent_hiring_agent(env),
-        'intelligent_queue': create_intelligent_queue_agent(env),
-        'distance_based': create_distance_based_agent(env),
-        'aggressive_swap': create_aggressive_swap_agent(env)
-    }
\ No newline at end of file
+    return {name: create(env) for name, create in STANDARDIZED_AGENT_FACTORIES.items()}
\ No newline at end of file
@@ -10,6 +10,13 @@ class EmployeeState(Enum):
     DELIVERING = 3
     RELOCATING_ITEM = 4
 
+def _item_mask(items) -> int:
+    """Bitmask of item types (Python ints are unbounded, so any num_item_types fits)"""
+    mask = 0
+    for item in items:
+        mask |= 1 << int(item)
+    return mask
+
 class Employee:
     def __init__(self, employee_id: int, start_position: Tuple[int, int], salary_per_timestep: float = 0.30, is_manager: bool = False):
         self.id = employee_id
@@ -42,6 +49,8 @@ class Employee:
         self.last_collision_position = None  # Track where collision occurred
         self.collision_cooldown = 0  # Wait timer after moving to avoid collision
         self.failed_paths = set()  # Track failed pathfinding attempts to avoid repeating them
+        self._alternative_attempts = 0  # Alternative-target retries after a failed deadlock escape
+        self._recursion_guard = 0  # Nesting depth of _find_alternative_item_target
         
         # Stuck detection
         self.stuck_position = None
@@ -321,8 +330,7 @@ class Employee:
                         if not self.target_position:  # We just reached our target
                             if self.current_order_id:
                                 # Check if we have all items for the order
-                                items_needed = set(self.order_items) - set(self.items_collected)
-                                if not items_needed:  # All items collected
+                                if self._has_all_order_items():  # All items collected
                                     self.state = EmployeeState.DELIVERING
                                     self.task_timer = 0  # Reset timer for delivery
                                     nearest_truck_bay = warehouse_grid.get_nearest_truck_bay_position(self.position)
@@ -343,8 +351,6 @@ class Employee:
                         else:
                             # If can't find free space, try alternative target as last resort
                             # But avoid infinite recursion by limiting attempts
-                            if not hasattr(self, '_alternative_attempts'):
-                                self._alternative_attempts = 0
                             if self._alternative_attempts < 2:
                                 self._alternative_attempts += 1
                                 self._find_alternative_target(warehouse_grid)
@@ -374,20 +380,16 @@ class Employee:
         elif self.state == EmployeeState.PICKING_ITEM:
             if self.current_order_id:
                 # Check if we have a specific target item position or pick from current position
-                pick_position = getattr(self, 'target_item_position', None) or self.position
+                pick_position = self.target_item_position or self.position
                 item_at_pos = warehouse_grid.get_item_at_position(pick_position[0], pick_position[1])
                 
                 if item_at_pos is not None and item_at_pos in self.order_items:
                     if self.pick_item_from_position(warehouse_grid, item_at_pos, pick_position):
                         action_result['picked_item'] = item_at_pos
-                        if hasattr(self, 'target_item_position'):
-                            self.target_item_position = None  # Clear after picking
+                        self.target_item_position = None  # Clear after picking
                         
                         # Check if we have all items needed for the order
-                        items_needed = set(self.order_items)
-                        items_collected = set(self.items_collected)
-                        
-                        if items_needed.issubset(items_collected):
+                        if self._has_all_order_items():
                             # All items collected, go to delivery
                             self.state = EmployeeState.DELIVERING
                             self.task_timer = 0  # Reset timer for delivery
@@ -406,8 +408,7 @@ class Employee:
                     self.task_timer = 0
                     # Don't clear target_position here - let the MOVING state handle finding next item
                     # Only clear if we have no items left to collect
-                    items_needed = set(self.order_items) - set(self.items_collected)
-                    if not items_needed:
+                    if self._has_all_order_items():
                         # All items collected, go to delivery
                         self.state = EmployeeState.DELIVERING
                         nearest_truck_bay = warehouse_grid.get_nearest_truck_bay_position(self.position)
@@ -626,9 +627,8 @@ class Employee:
                     candidates.append((distance, location))
         
         if candidates:
-            # Return closest item with walkable access
-            candidates.sort(key=lambda x: x[0])
-            return candidates[0][1]
+            # Return closest item with walkable access (min keeps the first on ties, like a stable sort)
+            return min(candidates, key=lambda x: x[0])[1]
         
         return None
     
@@ -717,6 +717,11 @@ class Employee:
         if not self.target_position:
             self._reassess_current_task(warehouse_grid)
     
+    def _has_all_order_items(self) -> bool:
+        """Whether every item type in the order has been collected"""
+        needed = _item_mask(self.order_items)
+        return (needed & _item_mask(self.items_collected)) == needed
+    
     def calculate_path_to_target(self, warehouse_grid, target: Tuple[int, int]):
         self.target_position = target
         self._calculate_path(warehouse_grid)
@@ -865,8 +870,6 @@ class Employee:
     def _find_alternative_item_target(self, warehouse_grid, items_needed: set) -> bool:
         """Find alternative item targets avoiding traffic jam zones"""
         # Prevent recursion by limiting calls
-        if not hasattr(self, '_recursion_guard'):
-            self._recursion_guard = 0
         if self._recursion_guard > 2:
             return False
         
@@ -896,9 +899,8 @@ class Employee:
                             all_candidates.append((distance, location, walkable_pos))
             
             if all_candidates:
-                # Sort by distance and choose the closest safe option
-                all_candidates.sort(key=lambda x: x[0])
-                _, target_location, target_pos = all_candidates[0]
+                # Choose the closest safe option
+                _, target_location, target_pos = min(all_candidates, key=lambda x: x[0])
                 # Set target directly without recursion
                 self.target_position = target_pos
                 self._calculate_path_direct(warehouse_grid)
@@ -982,8 +984,7 @@ class Employee:
             return self._find_closest_needed_item(warehouse_grid, needed_items)
         
         # Return closest safe item
-        candidates.sort(key=lambda x: x[0])
-        return candidates[0][1]
+        return min(candidates, key=lambda x: x[0])[1]
 
     def _reassess_current_task(self, warehouse_grid):
         """Reassess and restart current task when completely lost"""
@@ -0,0 +1,40 @@
+"""
+Compiled per-cell grid scans.
+
+These kernels operate directly on the integer `cell_types` / `item_grid` arrays
+of a WarehouseGrid, or on the flat per-employee arrays kept by WarehouseEnv.
+Numba is optional: without it the decorator is a no-op and the same functions
+run as plain Python.
+"""
+
+import numpy as np
+
+# Optional numba import for compiled scans
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def count_narrow_corridor_cells(cell_types: np.ndarray, empty_value: int) -> int:
+    """Count interior corridor cells with no corridor neighbour on either axis"""
+    height, width = cell_types.shape
+    narrow = 0
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if cell_types[y, x] != empty_value:
+                continue
+            if cell_types[y, x - 1] == empty_value or cell_types[y, x + 1] == empty_value:
+                continue
+            if cell_types[y - 1, x] == empty_value or cell_types[y + 1, x] == empty_value:
+                continue
+            narrow += 1
+    return narrow
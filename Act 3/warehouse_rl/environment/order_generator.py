@@ -340,9 +340,16 @@ class OrderQueue:
         self.orders: List[Order] = []
         self.completed_orders: List[Order] = []
         self.cancelled_orders: List[Order] = []
+        # Pending and completed orders by id (cancelled/assigned orders are dropped)
+        self._orders_by_id: Dict[int, Order] = {}
     
     def add_order(self, order: Order):
         self.orders.append(order)
+        self._orders_by_id[order.id] = order
+    
+    def find_order(self, order_id: int) -> Optional[Order]:
+        """Look up a pending or completed order by id"""
+        return self._orders_by_id.get(order_id)
     
     def get_next_order(self) -> Optional[Order]:
         if self.orders:
@@ -352,6 +359,7 @@ class OrderQueue:
     def assign_order(self, order_id: int) -> Optional[Order]:
         for i, order in enumerate(self.orders):
             if order.id == order_id:
+                del self._orders_by_id[order_id]
                 return self.orders.pop(i)
         return None
     
@@ -368,6 +376,7 @@ class OrderQueue:
             if order.is_expired(current_time):
                 expired_orders.append(order)
                 self.cancelled_orders.append(order)
+                self._orders_by_id.pop(order.id, None)
             else:
                 remaining_orders.append(order)
         
@@ -7,6 +7,21 @@ from .warehouse_grid import WarehouseGrid
 from .employee import Employee, EmployeeState
 from .order_generator import OrderGenerator, OrderQueue, Order
 
+# Per-employee snapshot row (struct-of-arrays view of self.employees)
+EMPLOYEE_DTYPE = np.dtype([
+    ('id', np.int32),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('state', np.int8),
+    ('has_order', np.bool_),
+    ('items_collected', np.int32),
+    ('target_distance', np.int32),
+    ('is_manager', np.bool_),
+])
+
+# action['layout_swap'] value that requests no swap (any pair of equal indices is a no-op)
+NO_LAYOUT_SWAP = (0, 0)
+
 class WarehouseEnv(gym.Env):
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
     
@@ -33,6 +48,8 @@ class WarehouseEnv(gym.Env):
         self.initial_employees = initial_employees
         self.episode_length = episode_length
         self.employee_salary = employee_salary
+        self.order_arrival_rate = order_arrival_rate
+        self.order_timeout = order_timeout
         self.render_mode = render_mode
         
         # Initialize components
@@ -42,6 +59,7 @@ class WarehouseEnv(gym.Env):
         
         # Employee management
         self.employees: List[Employee] = []
+        self.employee_array = np.zeros(0, dtype=EMPLOYEE_DTYPE)  # Snapshot, see _sync_employee_array
         self.next_employee_id = 1
         
         # Episode state
@@ -52,6 +70,8 @@ class WarehouseEnv(gym.Env):
         
         # Relocation tracking
         self.relocations_history = []  # List of {item_type, from_pos, to_pos, timestep, status}
+        self.started_relocations = {}  # manager_id -> that manager's 'started' relocations, oldest first
+        self.completed_relocations = 0  # Running count of 'completed' entries in relocations_history
         self.last_swap_info = None  # Track last swap for analytics
         
         # Action space: Strategic and tactical decisions
@@ -95,6 +115,12 @@ class WarehouseEnv(gym.Env):
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[Dict, Dict]:
         super().reset(seed=seed)
         
+        # A seed restarts order generation as if the env had been built with that seed,
+        # so one instance can be reused for independently seeded episodes
+        if seed is not None:
+            self.order_generator = OrderGenerator(self.num_item_types, self.order_arrival_rate,
+                                                  self.order_timeout, seed)
+        
         # Reset environment state
         self.current_timestep = 0
         self.total_revenue = 0.0
@@ -113,11 +139,14 @@ class WarehouseEnv(gym.Env):
         
         # Reset relocation tracking
         self.relocations_history = []
+        self.started_relocations = {}
+        self.completed_relocations = 0
         
         # Create initial employees
         for _ in range(self.initial_employees):
             self._hire_employee()
         
+        self._sync_employee_array()
         observation = self._get_observation()
         info = self._get_info()
         
@@ -136,6 +165,7 @@ class WarehouseEnv(gym.Env):
         truncated = self.cumulative_profit < -1000  # Bankruptcy
         
         # Get new observation
+        self._sync_employee_array()
         observation = self._get_observation()
         info = self._get_info()
         
@@ -173,37 +203,46 @@ class WarehouseEnv(gym.Env):
         
         # Handle layout swaps
         pos1_idx, pos2_idx = action['layout_swap']
-        pos1 = (pos1_idx % self.grid_width, pos1_idx // self.grid_width)
-        pos2 = (pos2_idx % self.grid_width, pos2_idx // self.grid_width)
-        
-        if pos1 != pos2 and self._is_valid_swap(pos1, pos2):
-            # Find a manager to coordinate the swap
-            manager = self._get_manager()
-            if manager and manager.state == EmployeeState.IDLE:
-                # Track the relocation start
-                item1 = self.warehouse_grid.get_item_at_position(pos1[0], pos1[1])
-                item2 = self.warehouse_grid.get_item_at_position(pos2[0], pos2[1])
+        pos1_idx, pos2_idx = int(pos1_idx), int(pos2_idx)
+        
+        # Equal indices (including the [0, 0] no-op) can never swap, so skip decoding them
+        if pos1_idx != pos2_idx:
+            # Decode flat indices to (x, y) with one divmod each
+            pos1_y, pos1_x = divmod(pos1_idx, self.grid_width)
+            pos2_y, pos2_x = divmod(pos2_idx, self.grid_width)
+            pos1 = (pos1_x, pos1_y)
+            pos2 = (pos2_x, pos2_y)
+            
+            if self._is_valid_swap(pos1, pos2):
+                # Find a manager to coordinate the swap
+                manager = self._get_manager()
+                if manager and manager.state == EmployeeState.IDLE:
+                    # Track the relocation start
+                    item1 = self.warehouse_grid.get_item_at_position(pos1[0], pos1[1])
+                    item2 = self.warehouse_grid.get_item_at_position(pos2[0], pos2[1])
                 
-                if item1 is not None:
-                    self.relocations_history.append({
-                        'item_type': item1,
-                        'from_pos': pos1,
-                        'to_pos': pos2,
-                        'timestep': self.current_timestep,
-                        'status': 'started',
-                        'manager_id': manager.id
-                    })
+                    if item1 is not None:
+                        relocation = {
+                            'item_type': item1,
+                            'from_pos': pos1,
+                            'to_pos': pos2,
+                            'timestep': self.current_timestep,
+                            'status': 'started',
+                            'manager_id': manager.id
+                        }
+                        self.relocations_history.append(relocation)
+                        self.started_relocations.setdefault(manager.id, []).append(relocation)
                 
-                manager.set_relocation_task(pos1, pos2, self.warehouse_grid)
+                    manager.set_relocation_task(pos1, pos2, self.warehouse_grid)
                 
-                # Track swap for analytics
-                self.last_swap_info = {
-                    'source_item': item1,
-                    'target_item': item2,
-                    'source_pos': pos1,
-                    'target_pos': pos2,
-                    'manager_id': manager.id
-                }
+                    # Track swap for analytics
+                    self.last_swap_info = {
+                        'source_item': item1,
+                        'target_item': item2,
+                        'source_pos': pos1,
+                        'target_pos': pos2,
+                        'manager_id': manager.id
+                    }
         
         # Handle order assignments
         order_assignments = action['order_assignments']
@@ -212,8 +251,10 @@ class WarehouseEnv(gym.Env):
         # Track which orders are already assigned to employees
         currently_assigned_orders = {emp.current_order_id for emp in self.employees if emp.current_order_id is not None}
         
-        for i, employee_idx in enumerate(order_assignments):
-            if i < len(orders) and employee_idx > 0 and (employee_idx - 1) < len(self.employees):  # 0 means no assignment
+        # Only visit slots that carry an assignment (0 means no assignment)
+        for i in np.flatnonzero(np.asarray(order_assignments[:len(orders)])):
+            employee_idx = int(order_assignments[i])
+            if employee_idx > 0 and (employee_idx - 1) < len(self.employees):
                 employee = self.employees[employee_idx - 1]  # -1 because action uses 1-based indexing
                 order = orders[i]
                 # Only assign if employee is idle, not a manager, and order is not already claimed
@@ -245,13 +286,23 @@ class WarehouseEnv(gym.Env):
         for emp in self.employees:
             global_traffic_zones.update(emp.traffic_jam_zones)
         
+        # Occupancy count per position, kept current as employees move (several can share a cell)
+        occupancy = {}
+        for emp in self.employees:
+            occupancy[emp.position] = occupancy.get(emp.position, 0) + 1
+        
         for employee in self.employees:
             # Share global traffic information
             employee.global_traffic_zones = global_traffic_zones
             
-            # Add other employees' positions (not including current employee)
-            other_positions = {emp.position for emp in self.employees if emp != employee}
-            action_result = employee.step(self.warehouse_grid, other_positions)
+            # Other employees' positions: take this employee out while it steps
+            position = employee.position
+            if occupancy[position] == 1:
+                del occupancy[position]
+            else:
+                occupancy[position] -= 1
+            action_result = employee.step(self.warehouse_grid, occupancy.keys())
+            occupancy[employee.position] = occupancy.get(employee.position, 0) + 1
             
             # Apply collision penalty
             if action_result['collision']:
@@ -260,13 +311,13 @@ class WarehouseEnv(gym.Env):
             # Track completed relocations
             if action_result.get('completed_relocation', False):
                 # Mark the most recent relocation for this manager as completed
-                for relocation in reversed(self.relocations_history):
-                    if (relocation.get('manager_id') == employee.id and 
-                        relocation['status'] == 'started'):
-                        relocation['status'] = 'completed'
-                        relocation['completed_timestep'] = self.current_timestep
-                        # Relocation completed silently
-                        break
+                started = self.started_relocations.get(employee.id)
+                if started:
+                    relocation = started.pop()
+                    relocation['status'] = 'completed'
+                    relocation['completed_timestep'] = self.current_timestep
+                    self.completed_relocations += 1
+                    # Relocation completed silently
             
             # Handle completed deliveries
             if action_result['delivered_items']:
@@ -275,11 +326,7 @@ class WarehouseEnv(gym.Env):
                 
                 if completed_order_id:
                     # Find the order that was just completed
-                    order_to_complete = None
-                    for order in self.order_queue.orders + self.order_queue.completed_orders:
-                        if order.id == completed_order_id:
-                            order_to_complete = order
-                            break
+                    order_to_complete = self.order_queue.find_order(completed_order_id)
                     
                     if order_to_complete:
                         # Mark order as delivered
@@ -332,6 +379,39 @@ class WarehouseEnv(gym.Env):
         
         return timestep_reward
     
+    def _sync_employee_array(self):
+        """Snapshot employee state into self.employee_array (one row per employee, same order)
+        
+        Taken before every observation and on every hire/fire, so rows always match self.employees.
+        """
+        grid = self.warehouse_grid
+        rows = []
+        for employee in self.employees:
+            target_distance = 0
+            if employee.target_position:
+                target_distance = grid.manhattan_distance(employee.position, employee.target_position)
+            rows.append((
+                employee.id,
+                employee.position[0],
+                employee.position[1],
+                employee.state.value,
+                bool(employee.current_order_id),
+                len(employee.items_collected),
+                target_distance,
+                employee.is_manager
+            ))
+        self.employee_array = np.array(rows, dtype=EMPLOYEE_DTYPE)
+    
+    @property
+    def num_active_employees(self) -> int:
+        """Number of employees currently on staff"""
+        return len(self.employees)
+    
+    @property
+    def has_manager(self) -> bool:
+        """Whether any employee is a manager (read from the employee snapshot)"""
+        return bool(self.employee_array['is_manager'].any())
+    
     def _hire_employee(self, is_manager: bool = False, custom_salary: float = None):
         spawn_position = self.warehouse_grid.spawn_zones[len(self.employees) % len(self.warehouse_grid.spawn_zones)]
         if custom_salary is not None:
@@ -341,15 +421,18 @@ class WarehouseEnv(gym.Env):
         employee = Employee(self.next_employee_id, spawn_position, salary, is_manager)
         self.employees.append(employee)
         self.next_employee_id += 1
+        self._sync_employee_array()
     
     def _fire_employee(self):
         if self.employees:
             # Fire the first idle employee, or the last employee if none are idle
-            idle_employees = [emp for emp in self.employees if emp.state == EmployeeState.IDLE]
-            if idle_employees:
-                self.employees.remove(idle_employees[0])
-            else:
-                self.employees.pop()
+            fire_idx = len(self.employees) - 1
+            for i, emp in enumerate(self.employees):
+                if emp.state == EmployeeState.IDLE:
+                    fire_idx = i
+                    break
+            self.employees.pop(fire_idx)
+            self._sync_employee_array()
     
     def _get_idle_employee(self) -> Optional[Employee]:
         for employee in self.employees:
@@ -358,10 +441,8 @@ class WarehouseEnv(gym.Env):
         return None
     
     def _get_manager(self) -> Optional[Employee]:
-        for employee in self.employees:
-            if employee.is_manager:
-                return employee
-        return None
+        managers = np.flatnonzero(self.employee_array['is_manager'])
+        return self.employees[managers[0]] if managers.size else None
     
     def _is_valid_swap(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
         x1, y1 = pos1
@@ -371,9 +452,8 @@ class WarehouseEnv(gym.Env):
                 self.warehouse_grid.is_valid_position(x2, y2)):
             return False
         
-        from .warehouse_grid import CellType
-        return (self.warehouse_grid.cell_types[y1, x1] == CellType.STORAGE.value and
-                self.warehouse_grid.cell_types[y2, x2] == CellType.STORAGE.value)
+        storage_mask = self.warehouse_grid.storage_mask
+        return bool(storage_mask[y1, x1] and storage_mask[y2, x2])
     
     def _assign_employee_to_order(self, employee: Employee, order: Order):
         # Find the closest item needed for this order
@@ -425,14 +505,15 @@ class WarehouseEnv(gym.Env):
                     self._assign_employee_to_order(employee, order)
     
     def _get_observation(self) -> Dict:
+        # Every array is built directly in its observation-space dtype (one allocation each)
         # Warehouse grid observation
-        warehouse_obs = self.warehouse_grid.item_grid.copy()
+        warehouse_obs = np.array(self.warehouse_grid.item_grid, dtype=np.int32)
         
         # Item access frequency
-        item_freq = self.warehouse_grid.item_access_frequency.copy()
+        item_freq = np.array(self.warehouse_grid.item_access_frequency, dtype=np.float32)
         
         # Order queue observation (pad/truncate to fixed size)
-        queue_obs = np.zeros((20, 4))
+        queue_obs = np.zeros((20, 4), dtype=np.float32)
         queue_state = self.order_queue.get_queue_state(self.current_timestep)
         for i, order_info in enumerate(queue_state[:20]):
             queue_obs[i] = [
@@ -442,23 +523,16 @@ class WarehouseEnv(gym.Env):
                 self.current_timestep - order_info['arrival_time']
             ]
         
-        # Employee observations
-        employee_obs = np.zeros((self.max_employees, 6))
-        for i, employee in enumerate(self.employees[:self.max_employees]):
-            target_distance = 0
-            if employee.target_position:
-                target_distance = self.warehouse_grid.manhattan_distance(
-                    employee.position, employee.target_position
-                )
-            
-            employee_obs[i] = [
-                employee.position[0],
-                employee.position[1],
-                employee.state.value,
-                1 if employee.current_order_id else 0,
-                len(employee.items_collected),
-                target_distance
-            ]
+        # Employee observations (from the snapshot taken by _sync_employee_array)
+        employee_obs = np.zeros((self.max_employees, 6), dtype=np.float32)
+        snapshot = self.employee_array[:self.max_employees]
+        n = len(snapshot)
+        employee_obs[:n, 0] = snapshot['x']
+        employee_obs[:n, 1] = snapshot['y']
+        employee_obs[:n, 2] = snapshot['state']
+        employee_obs[:n, 3] = snapshot['has_order']
+        employee_obs[:n, 4] = snapshot['items_collected']
+        employee_obs[:n, 5] = snapshot['target_distance']
         
         # Financial state
         burn_rate = sum(emp.salary_per_timestep for emp in self.employees)
@@ -467,18 +541,18 @@ class WarehouseEnv(gym.Env):
             self.total_revenue,
             self.total_costs,
             burn_rate
-        ])
+        ], dtype=np.float32)
         
         # Time
-        time_obs = np.array([self.current_timestep])
+        time_obs = np.array([self.current_timestep], dtype=np.int32)
         
         return {
-            'warehouse_grid': warehouse_obs.astype(np.int32),
-            'item_access_frequency': item_freq.astype(np.float32),
-            'order_queue': queue_obs.astype(np.float32),
-            'employees': employee_obs.astype(np.float32),
-            'financial': financial_obs.astype(np.float32),
-            'time': time_obs.astype(np.int32)
+            'warehouse_grid': warehouse_obs,
+            'item_access_frequency': item_freq,
+            'order_queue': queue_obs,
+            'employees': employee_obs,
+            'financial': financial_obs,
+            'time': time_obs
         }
     
     def _get_info(self) -> Dict:
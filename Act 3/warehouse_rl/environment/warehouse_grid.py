@@ -68,6 +68,12 @@ class WarehouseGrid:
         
         # Ensure connectivity
         self._ensure_connectivity()
+        
+        # Storage mask and (x, y) of every storage cell in row-major order, taken after
+        # connectivity fixes (which may turn storage into corridor) so they match cell_types
+        self.storage_mask = self.cell_types == CellType.STORAGE.value
+        ys, xs = np.nonzero(self.storage_mask)
+        self.storage_xy = np.column_stack((xs, ys))
     
     def _create_main_corridors(self):
         """Create 2-wide main corridors for navigation"""
@@ -295,7 +301,7 @@ class WarehouseGrid:
             return False
         
         # Check if the target position is a storage cell (required for placing items)
-        if self.cell_types[y, x] != CellType.STORAGE.value:
+        if not self.storage_mask[y, x]:
             print(f"WARNING: set_item_at_position failed - position ({x}, {y}) is not storage (type: {self.cell_types[y, x]})")
             return False
         
@@ -321,12 +327,21 @@ class WarehouseGrid:
         return item if item != -1 else None
     
     def find_item_locations(self, item_type: int) -> List[Tuple[int, int]]:
-        locations = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.item_grid[y, x] == item_type:
-                    locations.append((x, y))
-        return locations
+        # Single vectorized pass; np.nonzero yields row-major order like a y/x scan
+        ys, xs = np.nonzero(self.item_grid == item_type)
+        return list(zip(xs.tolist(), ys.tolist()))
+    
+    def first_item_locations(self) -> np.ndarray:
+        """(x, y) of every item type's first location in row-major order, (-1, -1) if not stored"""
+        first_loc = np.full((self.num_item_types, 2), -1, dtype=np.int64)
+        flat = self.item_grid.ravel()
+        # return_index gives each value's first flat index in one sorted sweep
+        item_types, first_idx = np.unique(flat, return_index=True)
+        stored = (item_types >= 0) & (item_types < self.num_item_types)
+        ys, xs = np.divmod(first_idx[stored], self.width)
+        first_loc[item_types[stored], 0] = xs
+        first_loc[item_types[stored], 1] = ys
+        return first_loc
     
     def is_valid_position(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -354,7 +369,7 @@ class WarehouseGrid:
             return False
         
         # Must be a storage location
-        if self.cell_types[y, x] != CellType.STORAGE.value:
+        if not self.storage_mask[y, x]:
             return False
         
         # Check if there's at least one adjacent walkable cell
@@ -392,8 +407,7 @@ class WarehouseGrid:
         if not (self.is_valid_position(x1, y1) and self.is_valid_position(x2, y2)):
             return False
         
-        if not (self.cell_types[y1, x1] == CellType.STORAGE.value and 
-                self.cell_types[y2, x2] == CellType.STORAGE.value):
+        if not (self.storage_mask[y1, x1] and self.storage_mask[y2, x2]):
             return False
         
         # Swap the items
@@ -4,17 +4,20 @@ import argparse
 import sys
 import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
+import numpy as np
+
 # Suppress numpy warnings about empty slices and division
 warnings.filterwarnings("ignore", message="Mean of empty slice")
 warnings.filterwarnings("ignore", message="invalid value encountered in scalar divide")
 
 from environment.warehouse_env import WarehouseEnv
-from agents.baselines import get_baseline_agents
+from agents.baselines import get_baseline_agents, create_baseline_agent, baseline_agent_names
 from analytics.simulation_analytics import SimulationAnalytics
 
-def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1):
+def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1, seed: Optional[int] = None):
     """Run a demo of the warehouse environment with a specific agent"""
     
     print(f"Running warehouse simulation with {agent_name} agent...")
@@ -27,6 +30,7 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
         'render_mode': 'human' if render else None,
         'episode_length': 2000,  # Shorter episodes for demo
         'order_arrival_rate': 0.5,
+        'seed': seed,
     }
     
     env = WarehouseEnv(**env_kwargs)
@@ -45,7 +49,7 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
             agent_name = "greedy"
     
     if agent_name != "rl":
-        baseline_agents = get_baseline_agents(env)
+        baseline_agents = get_baseline_agents(env, seed=seed)
         if agent_name not in baseline_agents:
             print(f"Unknown agent: {agent_name}")
             print(f"Available agents: {list(baseline_agents.keys())}")
@@ -56,6 +60,12 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
     total_rewards = []
     total_profits = []
     
+    # Loop invariants: episodes reset without a seed, so the order generator is kept for the run
+    order_gen = env.order_generator
+    day_length = order_gen.day_length
+    timesteps_per_hour = order_gen.timesteps_per_hour
+    record_timestep = analytics.record_timestep
+    
     for episode in range(episodes):
         print(f"\n--- Episode {episode + 1}/{episodes} ---")
         
@@ -79,10 +89,12 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
                 episode_reward += reward
                 step_count += 1
                 
-                # Record metrics for analytics
-                order_gen = env.order_generator
+                # Record metrics for analytics (each multiplier evaluated once per step)
                 queue_len = info.get('queue_length', 0)
                 num_employees = info.get('num_employees', 1)
+                time_multiplier = order_gen._get_time_of_day_multiplier(step_count)
+                satisfaction_multiplier = order_gen._get_satisfaction_multiplier()
+                pressure_multiplier = order_gen._get_queue_pressure_multiplier(queue_len, num_employees)
                 
                 metrics = {
                     'cumulative_profit': info.get('profit', 0),
@@ -93,19 +105,17 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
                     'orders_cancelled': info.get('orders_cancelled', 0),
                     # Adaptive order generation metrics
                     'customer_satisfaction': order_gen.customer_satisfaction,
-                    'time_multiplier': order_gen._get_time_of_day_multiplier(step_count),
-                    'satisfaction_multiplier': order_gen._get_satisfaction_multiplier(),
-                    'pressure_multiplier': order_gen._get_queue_pressure_multiplier(queue_len, num_employees),
-                    'effective_arrival_rate': (order_gen.base_arrival_rate * 
-                                             order_gen._get_time_of_day_multiplier(step_count) *
-                                             order_gen._get_satisfaction_multiplier() *
-                                             order_gen._get_queue_pressure_multiplier(queue_len, num_employees)),
-                    'hour_of_day': (step_count % order_gen.day_length) / order_gen.timesteps_per_hour
+                    'time_multiplier': time_multiplier,
+                    'satisfaction_multiplier': satisfaction_multiplier,
+                    'pressure_multiplier': pressure_multiplier,
+                    'effective_arrival_rate': (order_gen.base_arrival_rate * time_multiplier *
+                                             satisfaction_multiplier * pressure_multiplier),
+                    'hour_of_day': (step_count % day_length) / timesteps_per_hour
                 }
-                analytics.record_timestep(step_count, metrics)
+                record_timestep(step_count, metrics)
                 
                 # Record layout swaps if they occurred
-                if hasattr(env, 'last_swap_info') and env.last_swap_info:
+                if env.last_swap_info:
                     analytics.record_swap(step_count, env.last_swap_info)
                     env.last_swap_info = None  # Clear after recording
                 
@@ -165,52 +175,80 @@ def run_demo(agent_name: str = "greedy", render: bool = True, episodes: int = 1)
     print(f"\nDisplaying analytics for {agent_name} agent...")
     analytics.show_analytics(agent_name)
 
-def run_benchmark(episodes: int = 10):
+def _benchmark_agent(agent_name: str, episodes: int, seed: Optional[int] = None,
+                     show_progress: bool = False):
+    """Run all benchmark episodes for one agent on its own environment"""
+    # Agents draw from the global np.random stream, which forked workers would otherwise
+    # share; a None seed reseeds from OS entropy
+    np.random.seed(seed)
+    env = WarehouseEnv(episode_length=3000, seed=seed)
+    agent = create_baseline_agent(agent_name, env, seed=seed, record_history=False)
+    
+    # One slot per episode, filled in place
+    episode_rewards = np.empty(episodes, dtype=np.float64)
+    episode_profits = np.empty(episodes, dtype=np.float64)
+    episode_completion_rates = np.empty(episodes, dtype=np.float64)
+    
+    for episode in range(episodes):
+        obs, _ = env.reset()
+        agent.reset()
+        
+        episode_reward = 0
+        
+        while True:
+            action = agent.get_action(obs)
+            obs, reward, terminated, truncated, info = env.step(action)
+            episode_reward += reward
+            
+            if terminated or truncated:
+                break
+        
+        episode_rewards[episode] = episode_reward
+        episode_profits[episode] = info.get('profit', 0)
+        episode_completion_rates[episode] = info.get('completion_rate', 0)
+        
+        if show_progress:
+            # Show percentage completion
+            percent_complete = int(((episode + 1) / episodes) * 100)
+            print(f'\rTesting {agent_name}... [{percent_complete}% complete]', end='', flush=True)
+    
+    env.close()
+    return episode_rewards, episode_profits, episode_completion_rates
+
+def run_benchmark(episodes: int = 10, seed: Optional[int] = None, workers: int = 1):
     """Run benchmark comparison of all agents"""
     
     print(f"Running benchmark with {episodes} episodes per agent...")
     
-    env = WarehouseEnv(episode_length=3000)
-    baseline_agents = get_baseline_agents(env)
+    agent_names = baseline_agent_names()
+    
+    # Agents are independent, so run them in separate processes (the simulation is GIL-bound)
+    if workers > 1:
+        print(f"Running {len(agent_names)} agents across {workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(_benchmark_agent, name, episodes, seed)
+                       for name in agent_names}
+            agent_results = {name: future.result() for name, future in futures.items()}
+    else:
+        agent_results = None
     
     results = {}
     
-    for agent_name, agent in baseline_agents.items():
+    for agent_name in agent_names:
         print(f"\nTesting {agent_name}...", end='', flush=True)
         
-        episode_rewards = []
-        episode_profits = []
-        episode_completion_rates = []
-        
-        for episode in range(episodes):
-            obs, _ = env.reset()
-            agent.reset()
-            
-            episode_reward = 0
-            
-            while True:
-                action = agent.get_action(obs)
-                obs, reward, terminated, truncated, info = env.step(action)
-                episode_reward += reward
-                
-                if terminated or truncated:
-                    break
-            
-            episode_rewards.append(episode_reward)
-            episode_profits.append(info.get('profit', 0))
-            episode_completion_rates.append(info.get('completion_rate', 0))
-            
-            # Show percentage completion
-            percent_complete = int(((episode + 1) / episodes) * 100)
-            print(f'\rTesting {agent_name}... [{percent_complete}% complete]', end='', flush=True)
+        if agent_results is not None:
+            episode_rewards, episode_profits, episode_completion_rates = agent_results[agent_name]
+        else:
+            episode_rewards, episode_profits, episode_completion_rates = _benchmark_agent(
+                agent_name, episodes, seed, show_progress=True)
         
         # Calculate statistics with confidence intervals
-        avg_reward = sum(episode_rewards) / len(episode_rewards)
-        avg_profit = sum(episode_profits) / len(episode_profits)
-        avg_completion_rate = sum(episode_completion_rates) / len(episode_completion_rates)
+        avg_reward = episode_rewards.mean()
+        avg_profit = episode_profits.mean()
+        avg_completion_rate = episode_completion_rates.mean()
         
         # Calculate 95% confidence intervals
-        import numpy as np
         profit_std = np.std(episode_profits)
         profit_ci = 1.96 * profit_std / np.sqrt(len(episode_profits)) if len(episode_profits) > 1 else 0
         
@@ -243,7 +281,6 @@ def run_benchmark(episodes: int = 10):
               f"Profit: ${stats['avg_profit']:8.2f} ± ${profit_ci:6.2f} | "
               f"Completion: {stats['avg_completion_rate']:6.1%} ± {completion_ci:5.1%}")
     
-    env.close()
     return results
 
 def main():
@@ -260,6 +297,12 @@ def main():
                       help="Disable rendering")
     parser.add_argument("--timesteps", type=int, default=1000000,
                       help="Training timesteps (for train mode)")
+    parser.add_argument("--num-envs", type=int, default=1,
+                      help="Parallel environments (for train mode)")
+    parser.add_argument("--seed", type=int, default=None,
+                      help="Random seed for the environment and agents")
+    parser.add_argument("--workers", type=int, default=1,
+                      help="Worker processes for benchmark mode")
     
     args = parser.parse_args()
     
@@ -267,13 +310,14 @@ def main():
         run_demo(
             agent_name=args.agent,
             render=not args.no_render,
-            episodes=args.episodes
+            episodes=args.episodes,
+            seed=args.seed
         )
     elif args.mode == "benchmark":
-        run_benchmark(episodes=args.episodes)
+        run_benchmark(episodes=args.episodes, seed=args.seed, workers=args.workers)
     elif args.mode == "train":
         from training.train import train_ppo_agent
-        train_ppo_agent(total_timesteps=args.timesteps)
+        train_ppo_agent(total_timesteps=args.timesteps, n_envs=args.num_envs)
     else:
         print(f"Unknown mode: {args.mode}")
         return 1
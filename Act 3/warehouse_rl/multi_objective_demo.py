@@ -8,10 +8,12 @@ in the warehouse environment. Shows clear intersection points and optimization c
 
 import numpy as np
 import matplotlib.pyplot as plt
+import os
 import sys
 import warnings
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Optional scipy import for smooth curves
 try:
@@ -26,22 +28,9 @@ warnings.filterwarnings("ignore")
 from environment.warehouse_env import WarehouseEnv
 from agents.multi_objective_agent import create_multi_objective_agents
 
-def run_multi_objective_experiment(episodes: int = 5, episode_length: int = 2000) -> Dict:
-    """Run multi-objective optimization experiment"""
-    
-    print("🎯 Multi-Objective Optimization Demo")
-    print("=====================================")
-    print(f"Running {episodes} episodes per configuration...")
-    print(f"Testing {len(create_multi_objective_agents(None))} different wage levels...")
-    print("Objectives: Profit Maximization vs Service Quality")
-    print("💰 Wage-based productivity tradeoffs:")
-    print("   • Blue points: Low wages, slow workers, low cost")
-    print("   • Red points: High wages, fast workers, high cost")  
-    print("   • Pareto frontier shows optimal tradeoff curve")
-    print()
-    
-    # Create environment with controlled parameters for clear tradeoffs
-    env = WarehouseEnv(
+def _make_experiment_env(episode_length: int, seed: Optional[int] = None) -> WarehouseEnv:
+    """Create environment with controlled parameters for clear tradeoffs"""
+    return WarehouseEnv(
         episode_length=episode_length,
         order_arrival_rate=0.40,  # Moderate pressure to allow strategy differences
         initial_employees=2,      # Start lean
@@ -49,57 +38,97 @@ def run_multi_objective_experiment(episodes: int = 5, episode_length: int = 2000
         employee_salary=0.5,      # Medium baseline wage
         grid_width=15,
         grid_height=15,
-        num_item_types=30
+        num_item_types=30,
+        seed=seed
     )
+
+def _run_agent_episodes(agent_name: str, episodes: int, episode_length: int,
+                        seed: Optional[int] = None, show_progress: bool = False) -> List[Dict]:
+    """Run all episodes for one agent on its own environment"""
+    np.random.seed(seed)  # Own global stream per agent (strategic swaps use np.random.choice)
+    env = _make_experiment_env(episode_length, seed)
+    agent = create_multi_objective_agents(env)[agent_name]
     
-    # Create multi-objective agents
-    agents = create_multi_objective_agents(env)
+    episode_results = []
     
-    results = {}
+    # One completion-rate sample per 100 timesteps, reused across episodes
+    service_buf = np.empty((episode_length + 99) // 100, dtype=np.float32)
     
-    for agent_name, agent in agents.items():
-        print(f"Testing {agent_name}...", end='', flush=True)
+    for episode in range(episodes):
+        obs, info = env.reset()
+        agent.reset()
         
-        episode_results = []
+        num_samples = 0
         
-        for episode in range(episodes):
-            obs, _ = env.reset()
-            agent.reset()
-            
-            episode_profit = 0
-            episode_service_metrics = []
-            timestep = 0
-            
-            while timestep < episode_length:
-                action = agent.get_action(obs)
-                obs, reward, terminated, truncated, info = env.step(action)
-                
-                # Track metrics every 100 timesteps for stability
-                if timestep % 100 == 0:
-                    current_profit = info.get('profit', 0)
-                    completion_rate = info.get('completion_rate', 0)
-                    episode_service_metrics.append(completion_rate)
-                
-                timestep += 1
-                
-                if terminated or truncated:
-                    break
+        for timestep in range(episode_length):
+            action = agent.get_action(obs)
+            obs, reward, terminated, truncated, info = env.step(action)
             
-            # Record episode results
-            final_profit = info.get('profit', 0)
-            avg_service_rate = np.mean(episode_service_metrics) if episode_service_metrics else 0
-            
-            episode_results.append({
-                'profit': final_profit,
-                'service_rate': avg_service_rate,
-                'completion_rate': info.get('completion_rate', 0),
-                'orders_completed': info.get('orders_completed', 0),
-                'orders_cancelled': info.get('orders_cancelled', 0)
-            })
+            # Track metrics every 100 timesteps for stability
+            if timestep % 100 == 0:
+                service_buf[num_samples] = info['completion_rate']
+                num_samples += 1
             
+            if terminated or truncated:
+                break
+        
+        # Record episode results (env._get_info always provides these keys)
+        avg_service_rate = float(service_buf[:num_samples].mean()) if num_samples else 0
+        
+        episode_results.append({
+            'profit': info['profit'],
+            'service_rate': avg_service_rate,
+            'completion_rate': info['completion_rate'],
+            'orders_completed': info['orders_completed'],
+            'orders_cancelled': info['orders_cancelled']
+        })
+        
+        if show_progress:
             # Progress indicator
             percent = int(((episode + 1) / episodes) * 100)
             print(f'\r{agent_name}... [{percent}%]', end='', flush=True)
+    
+    env.close()
+    return episode_results
+
+def run_multi_objective_experiment(episodes: int = 5, episode_length: int = 2000,
+                                   workers: int = 1, seed: Optional[int] = None) -> Dict:
+    """Run multi-objective optimization experiment"""
+    
+    # Agents only need the env once they act, so build them unbound for names and weights
+    agents = create_multi_objective_agents(None)
+    
+    print("🎯 Multi-Objective Optimization Demo")
+    print("=====================================")
+    print(f"Running {episodes} episodes per configuration...")
+    print(f"Testing {len(agents)} different wage levels...")
+    print("Objectives: Profit Maximization vs Service Quality")
+    print("💰 Wage-based productivity tradeoffs:")
+    print("   • Blue points: Low wages, slow workers, low cost")
+    print("   • Red points: High wages, fast workers, high cost")  
+    print("   • Pareto frontier shows optimal tradeoff curve")
+    print()
+    
+    # One worker process per agent when asked, as in main.run_benchmark
+    if workers > 1:
+        print(f"Running {len(agents)} agents across {workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(_run_agent_episodes, name, episodes, episode_length, seed)
+                       for name in agents}
+            agent_results = {name: future.result() for name, future in futures.items()}
+    else:
+        agent_results = None
+    
+    results = {}
+    
+    for agent_name, agent in agents.items():
+        print(f"Testing {agent_name}...", end='', flush=True)
+        
+        if agent_results is not None:
+            episode_results = agent_results[agent_name]
+        else:
+            episode_results = _run_agent_episodes(agent_name, episodes, episode_length, seed,
+                                                  show_progress=True)
         
         # Calculate statistics
         profits = [r['profit'] for r in episode_results]
@@ -121,7 +150,6 @@ def run_multi_objective_experiment(episodes: int = 5, episode_length: int = 2000
         print(f"  Avg Profit: ${results[agent_name]['avg_profit']:.1f}, "
               f"Service Rate: {results[agent_name]['avg_completion_rate']:.1%}")
     
-    env.close()
     return results
 
 def plot_pareto_frontier(results: Dict):
@@ -363,7 +391,9 @@ def main():
     print("Starting Multi-Objective Warehouse Optimization Demo...")
     
     # Run experiment with multiple runs for statistical reliability
-    results = run_multi_objective_experiment(episodes=5, episode_length=2000)
+    # Wage levels are independent, so spread them across all cores
+    results = run_multi_objective_experiment(episodes=5, episode_length=2000,
+                                             workers=os.cpu_count() or 1)
     
     # Display results
     print_detailed_results(results)
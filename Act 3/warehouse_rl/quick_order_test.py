@@ -3,7 +3,10 @@
 Quick test to see if orders are being processed at all.
 """
 
+import numpy as np
+
 from environment.warehouse_env import WarehouseEnv
+from environment.employee import EmployeeState
 from agents.standardized_agents import create_greedy_agent
 
 def main():
@@ -16,12 +19,11 @@ def main():
     )
     
     agent = create_greedy_agent(env)
-    obs = env.reset()
+    obs, info = env.reset()
     
     print("=== Quick Order Processing Test ===")
     
     for step in range(500):
-        obs = env._get_observation()
         action = agent.get_action(obs)
         obs, reward, done, truncated, info = env.step(action)
         
@@ -29,7 +31,7 @@ def main():
         if step % 50 == 0:
             queue_length = len(env.order_queue.orders)
             num_employees = len(env.employees)
-            idle_employees = sum(1 for emp in env.employees if emp.state.name == 'IDLE')
+            idle_employees = int(np.count_nonzero(env.employee_array['state'] == EmployeeState.IDLE.value))
             profit = env.cumulative_profit
             orders_completed = info.get('total_completed_orders', 0)
             
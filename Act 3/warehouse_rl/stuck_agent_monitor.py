@@ -8,15 +8,24 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from environment.warehouse_env import WarehouseEnv
+from environment.warehouse_env import WarehouseEnv, NO_LAYOUT_SWAP
 from environment.employee import Employee, EmployeeState
 from environment.warehouse_grid import WarehouseGrid, CellType
+from environment.grid_scan_numba import count_narrow_corridor_cells
 import numpy as np
 import time
 
+# Log levels for StuckAgentMonitor.log (messages below min_level are dropped unformatted)
+LOG_LEVELS = {"DEBUG": 0, "INFO": 1, "WARNING": 2}
+
 class StuckAgentMonitor:
-    def __init__(self, env):
+    __slots__ = ("env", "min_level", "pending_output", "stuck_history", "stuck_counters",
+                 "position_history", "collision_counts", "max_history", "stuck_threshold")
+    
+    def __init__(self, env, min_level: str = "DEBUG"):
         self.env = env
+        self.min_level = LOG_LEVELS[min_level]
+        self.pending_output = []  # Emitted messages not yet written to stdout (see flush_log)
         self.stuck_history = {}  # agent_id -> list of stuck positions
         self.stuck_counters = {}  # agent_id -> consecutive stuck steps
         self.position_history = {}  # agent_id -> recent positions
@@ -61,9 +70,9 @@ class StuckAgentMonitor:
                         'position': current_pos,
                         'state': emp.state.name,
                         'stuck_steps': self.stuck_counters[emp_id],
-                        'target': getattr(emp, 'target_position', None),
-                        'order': getattr(emp, 'current_order_id', None),
-                        'path_length': len(getattr(emp, 'path', [])),
+                        'target': emp.target_position,
+                        'order': emp.current_order_id,
+                        'path_length': len(emp.path),
                         'recent_positions': list(recent_positions)
                     }
                     
@@ -74,23 +83,36 @@ class StuckAgentMonitor:
                         stuck_info['in_storage'] = True
                     
                     # Check collision indicators
-                    if hasattr(emp, 'collision_wait_count') and emp.collision_wait_count > 0:
+                    if emp.collision_wait_count > 0:
                         stuck_info['collision_wait'] = emp.collision_wait_count
                     
                     stuck_agents.append(stuck_info)
         
         return stuck_agents
     
+    def log(self, level: str, message: str, *args):
+        """Emit a %-style message if level is enabled; formatting is skipped otherwise"""
+        if LOG_LEVELS[level] < self.min_level:
+            return
+        self.pending_output.append(message % args if args else message)
+    
+    def flush_log(self):
+        """Write all buffered log messages to stdout in a single call"""
+        if self.pending_output:
+            sys.stdout.write("\n".join(self.pending_output) + "\n")
+            self.pending_output.clear()
+    
     def print_warehouse_layout(self):
         """Print detailed warehouse layout for analysis"""
         print("\n=== WAREHOUSE LAYOUT ANALYSIS ===")
         grid = self.env.warehouse_grid
         
-        # Count cell types
-        storage_count = np.sum(grid.cell_types == CellType.STORAGE.value)
-        corridor_count = np.sum(grid.cell_types == CellType.EMPTY.value)
-        packing_count = np.sum(grid.cell_types == CellType.PACKING_STATION.value)
-        spawn_count = np.sum(grid.cell_types == CellType.SPAWN_ZONE.value)
+        # Count all cell types in one pass over the grid
+        cell_counts = np.bincount(grid.cell_types.ravel(), minlength=len(CellType))
+        storage_count = cell_counts[CellType.STORAGE.value]
+        corridor_count = cell_counts[CellType.EMPTY.value]
+        packing_count = cell_counts[CellType.PACKING_STATION.value]
+        spawn_count = cell_counts[CellType.SPAWN_ZONE.value]
         
         print(f"Grid size: {grid.width}x{grid.height}")
         print(f"Storage cells: {storage_count}")
@@ -105,61 +127,42 @@ class StuckAgentMonitor:
         
         # Print grid with agent positions
         print("\nCurrent layout (S=storage, .=corridor, P=packing, Z=spawn, A=agent):")
-        employee_positions = {emp.position: f"A{emp.id}" for emp in self.env.employees}
+        rows, cols = min(20, grid.height), min(30, grid.width)  # Limit output
         
-        for y in range(min(20, grid.height)):  # Limit output
-            row = f"{y:2d}: "
-            for x in range(min(30, grid.width)):  # Limit output
-                pos = (x, y)
-                if pos in employee_positions:
-                    row += f"{employee_positions[pos]:>3}"
-                elif grid.cell_types[y, x] == CellType.STORAGE.value:
-                    item = grid.item_grid[y, x]
-                    if item != -1:
-                        row += f"S{item%10}"
-                    else:
-                        row += " E"
-                elif grid.cell_types[y, x] == CellType.PACKING_STATION.value:
-                    row += " P"
-                elif grid.cell_types[y, x] == CellType.SPAWN_ZONE.value:
-                    row += " Z"
-                elif grid.cell_types[y, x] == CellType.EMPTY.value:
-                    row += " ."
-                else:
-                    row += " ?"
-                row += " "
-            print(row)
+        # Employee id + 1 per cell (0 = no employee); later employees overwrite earlier ones
+        emp_grid = np.zeros((grid.height, grid.width), dtype=np.int16)
+        for emp in self.env.employees:
+            emp_grid[emp.position[1], emp.position[0]] = emp.id + 1
+        
+        # Cell type -> symbol, then overlay stored items and employees
+        symbols = np.full(len(CellType), " ?", dtype=object)
+        symbols[CellType.EMPTY.value] = " ."
+        symbols[CellType.STORAGE.value] = " E"
+        symbols[CellType.PACKING_STATION.value] = " P"
+        symbols[CellType.SPAWN_ZONE.value] = " Z"
+        cells = symbols[grid.cell_types[:rows, :cols]]
+        
+        items = grid.item_grid[:rows, :cols]
+        for y, x in zip(*np.nonzero((grid.cell_types[:rows, :cols] == CellType.STORAGE.value) & (items != -1))):
+            cells[y, x] = f"S{items[y, x] % 10}"
+        employees = emp_grid[:rows, :cols]
+        for y, x in zip(*np.nonzero(employees)):
+            cells[y, x] = f"{f'A{employees[y, x] - 1}':>3}"
+        
+        for y in range(rows):
+            print(f"{y:2d}: " + "".join(cell + " " for cell in cells[y]))
     
     def _analyze_corridor_widths(self):
         """Analyze corridor widths to check for 2-cell requirement"""
         grid = self.env.warehouse_grid
-        narrow_corridors = 0
-        
-        for y in range(1, grid.height - 1):
-            for x in range(1, grid.width - 1):
-                if grid.cell_types[y, x] == CellType.EMPTY.value:
-                    # Check horizontal corridor width
-                    horizontal_width = 1
-                    for dx in [-1, 1]:
-                        if (x + dx >= 0 and x + dx < grid.width and
-                            grid.cell_types[y, x + dx] == CellType.EMPTY.value):
-                            horizontal_width += 1
-                    
-                    # Check vertical corridor width
-                    vertical_width = 1
-                    for dy in [-1, 1]:
-                        if (y + dy >= 0 and y + dy < grid.height and
-                            grid.cell_types[y + dy, x] == CellType.EMPTY.value):
-                            vertical_width += 1
-                    
-                    # Count narrow spots
-                    if horizontal_width < 2 and vertical_width < 2:
-                        narrow_corridors += 1
-        
+
+        # A cell is narrow when it has no corridor neighbour horizontally or vertically
+        narrow_corridors = count_narrow_corridor_cells(grid.cell_types, CellType.EMPTY.value)
+
         print(f"  Narrow corridor cells (< 2 wide): {narrow_corridors}")
 
-def run_stuck_monitor_test():
-    """Run a full simulation with stuck agent monitoring"""
+def run_stuck_monitor_test(log_level: str = "DEBUG"):
+    """Run a full simulation with stuck agent monitoring (log_level="INFO" hides per-agent details)"""
     print("=== STUCK AGENT MONITORING TEST ===")
     
     # Create larger environment
@@ -173,7 +176,7 @@ def run_stuck_monitor_test():
         render_mode=None
     )
     
-    monitor = StuckAgentMonitor(env)
+    monitor = StuckAgentMonitor(env, min_level=log_level)
     
     # Reset environment
     obs, info = env.reset()
@@ -185,17 +188,18 @@ def run_stuck_monitor_test():
     max_steps = 200
     total_stuck_incidents = 0
     
+    # No-op action (let the environment auto-manage); the env only reads it, so build it once
+    action = {
+        'staffing_action': 0,
+        'layout_swap': NO_LAYOUT_SWAP,
+        'order_assignments': [0] * 20
+    }
+    
     for step in range(max_steps):
-        # Take a random action (let the environment auto-manage)
-        action = {
-            'staffing_action': 0,
-            'layout_swap': [0, 0],
-            'order_assignments': [0] * 20
-        }
-        
         try:
             obs, reward, done, truncated, info = env.step(action)
         except Exception as e:
+            monitor.flush_log()
             print(f"Environment error at step {step}: {e}")
             break
         
@@ -204,26 +208,32 @@ def run_stuck_monitor_test():
         
         if stuck_agents:
             total_stuck_incidents += len(stuck_agents)
-            print(f"\n🚨 STEP {step}: {len(stuck_agents)} agents stuck:")
+            monitor.log("WARNING", "\n🚨 STEP %d: %d agents stuck:", step, len(stuck_agents))
             for agent_info in stuck_agents:
-                print(f"  Agent {agent_info['id']}: {agent_info}")
+                monitor.log("DEBUG", "  Agent %s: %s", agent_info['id'], agent_info)
         
         # Periodic reports
         if step % stuck_report_interval == 0 and step > 0:
-            print(f"\n📊 Step {step} Status:")
-            print(f"  Active agents: {len([e for e in env.employees if e.state != EmployeeState.IDLE])}")
-            print(f"  Orders in queue: {len(env.order_queue.orders)}")
-            print(f"  Total stuck incidents so far: {total_stuck_incidents}")
+            monitor.log("INFO", "\n📊 Step %d Status:", step)
+            monitor.log("INFO", "  Active agents: %d", np.count_nonzero(env.employee_array['state'] != EmployeeState.IDLE.value))
+            monitor.log("INFO", "  Orders in queue: %d", len(env.order_queue.orders))
+            monitor.log("INFO", "  Total stuck incidents so far: %d", total_stuck_incidents)
             
             # Check for persistent stuck agents
             persistent_stuck = [info for info in stuck_agents if info['stuck_steps'] > 10]
             if persistent_stuck:
-                print(f"  ⚠️  {len(persistent_stuck)} agents persistently stuck!")
+                monitor.log("WARNING", "  ⚠️  %d agents persistently stuck!", len(persistent_stuck))
+            
+            # Write the stuck reports gathered since the last status report in one go
+            monitor.flush_log()
         
         if done or truncated:
+            monitor.flush_log()
             print(f"Simulation ended at step {step}")
             break
     
+    monitor.flush_log()
+    
     print(f"\n=== FINAL REPORT ===")
     print(f"Total simulation steps: {step + 1}")
     print(f"Total stuck incidents: {total_stuck_incidents}")
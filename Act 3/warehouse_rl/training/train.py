@@ -1,9 +1,12 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import numpy as np
 import matplotlib.pyplot as plt
 from stable_baselines3 import PPO, DQN
 from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import VecNormalize
+from stable_baselines3.common.vec_env import VecNormalize, DummyVecEnv, SubprocVecEnv
 from stable_baselines3.common.callbacks import BaseCallback, EvalCallback
 from stable_baselines3.common.monitor import Monitor
 import gymnasium as gym
@@ -12,7 +15,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from environment.warehouse_env import WarehouseEnv
-from agents.baselines import get_baseline_agents
+from agents.baselines import get_baseline_agents, create_baseline_agent
 
 class WarehouseTrainingCallback(BaseCallback):
     """Custom callback for monitoring training progress"""
@@ -86,14 +89,16 @@ def create_warehouse_env(**kwargs):
     """Factory function to create warehouse environment"""
     return WarehouseEnv(**kwargs)
 
-def train_ppo_agent(env_kwargs=None, total_timesteps=1000000, save_path="warehouse_ppo"):
+def train_ppo_agent(env_kwargs=None, total_timesteps=1000000, save_path="warehouse_ppo", n_envs=1):
     """Train a PPO agent on the warehouse environment"""
     
     if env_kwargs is None:
         env_kwargs = {}
     
-    # Create environment
-    env = make_vec_env(lambda: Monitor(create_warehouse_env(**env_kwargs)), n_envs=1)
+    # Create environment - step several copies per call to amortize Python overhead
+    vec_env_cls = SubprocVecEnv if n_envs > 1 else DummyVecEnv
+    env = make_vec_env(lambda: Monitor(create_warehouse_env(**env_kwargs)),
+                       n_envs=n_envs, vec_env_cls=vec_env_cls)
     env = VecNormalize(env, norm_obs=True, norm_reward=True)
     
     # Create PPO model
@@ -143,29 +148,29 @@ def train_dqn_agent(env_kwargs=None, total_timesteps=1000000, save_path="warehou
     
     return None, None
 
-def evaluate_agent(model, env, n_episodes=10):
-    """Evaluate a trained agent"""
+def evaluate_agent(model, env, n_episodes=10, seeds=None):
+    """Evaluate a trained agent (episode i resets with seeds[i] when seeds are given)"""
     episode_rewards = []
     episode_profits = []
     episode_completion_rates = []
     
     for episode in range(n_episodes):
-        obs = env.reset()
+        seed = None if seeds is None else seeds[episode]
+        obs, _ = env.reset(seed=seed)
         episode_reward = 0
         done = False
         
         while not done:
             action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, info = env.step(action)
+            obs, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
             episode_reward += reward
         
         episode_rewards.append(episode_reward)
-        if isinstance(info, list) and len(info) > 0:
-            episode_info = info[0]
-            if 'profit' in episode_info:
-                episode_profits.append(episode_info['profit'])
-            if 'completion_rate' in episode_info:
-                episode_completion_rates.append(episode_info['completion_rate'])
+        if 'profit' in info:
+            episode_profits.append(info['profit'])
+        if 'completion_rate' in info:
+            episode_completion_rates.append(info['completion_rate'])
     
     print(f"Evaluation Results ({n_episodes} episodes):")
     print(f"Average Reward: {np.mean(episode_rewards):.2f} ± {np.std(episode_rewards):.2f}")
@@ -180,7 +185,41 @@ def evaluate_agent(model, env, n_episodes=10):
         'completion_rates': episode_completion_rates
     }
 
-def compare_agents(env_kwargs=None, n_episodes=20):
+# Environment reused by every baseline episode run in this process (see _init_baseline_worker)
+_worker_env = None
+
+def _init_baseline_worker(env_kwargs):
+    """Build the one environment this process reuses for all of its baseline episodes"""
+    global _worker_env
+    _worker_env = create_warehouse_env(**env_kwargs)
+
+def _close_baseline_worker():
+    """Close and drop this process's reused environment"""
+    global _worker_env
+    if _worker_env is not None:
+        _worker_env.close()
+        _worker_env = None
+
+def _run_baseline_episode(agent_name, seed):
+    """Run one baseline episode on this process's environment, reseeded by episode"""
+    np.random.seed(seed)  # Random agents use the global stream, which forked workers would share
+    env = _worker_env
+    agent = create_baseline_agent(agent_name, env, seed=seed, record_history=False)
+    
+    obs, _ = env.reset(seed=seed)
+    agent.reset()
+    episode_reward = 0
+    done = False
+    
+    while not done:
+        action = agent.get_action(obs)
+        obs, reward, terminated, truncated, info = env.step(action)
+        done = terminated or truncated
+        episode_reward += reward
+    
+    return episode_reward, info.get('profit', 0), info.get('completion_rate', 0)
+
+def compare_agents(env_kwargs=None, n_episodes=20, workers=1):
     """Compare RL agent with baseline agents"""
     
     if env_kwargs is None:
@@ -188,49 +227,54 @@ def compare_agents(env_kwargs=None, n_episodes=20):
     
     # Create environment for baselines
     env = create_warehouse_env(**env_kwargs)
-    baseline_agents = get_baseline_agents(env)
+    agent_names = list(get_baseline_agents(env).keys())
     
     results = {}
     
+    # Episodes are independent (each seeded by its index), so spread them over
+    # worker processes when asked. Each process builds its environment once and
+    # resets it per episode.
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_baseline_worker,
+                                       initargs=(env_kwargs,))
+        run_map = executor.map
+    else:
+        executor = None
+        _init_baseline_worker(env_kwargs)
+        run_map = map
+    
     # Evaluate baseline agents
-    for name, agent in baseline_agents.items():
-        print(f"\nEvaluating {name}...")
-        agent_rewards = []
-        agent_profits = []
-        agent_completion_rates = []
-        
-        for episode in range(n_episodes):
-            obs, _ = env.reset()
-            agent.reset()
-            episode_reward = 0
-            done = False
+    try:
+        for name in agent_names:
+            print(f"\nEvaluating {name}...")
+            episode_results = np.array(list(run_map(_run_baseline_episode,
+                                                    repeat(name, n_episodes),
+                                                    range(n_episodes))),
+                                       dtype=np.float64).reshape(-1, 3)
+            agent_rewards, agent_profits, agent_completion_rates = episode_results.T
             
-            while not done:
-                action = agent.get_action(obs)
-                obs, reward, terminated, truncated, info = env.step(action)
-                done = terminated or truncated
-                episode_reward += reward
+            results[name] = {
+                'rewards': agent_rewards,
+                'profits': agent_profits,
+                'completion_rates': agent_completion_rates
+            }
             
-            agent_rewards.append(episode_reward)
-            agent_profits.append(info.get('profit', 0))
-            agent_completion_rates.append(info.get('completion_rate', 0))
-        
-        results[name] = {
-            'rewards': agent_rewards,
-            'profits': agent_profits,
-            'completion_rates': agent_completion_rates
-        }
-        
-        print(f"Average Reward: {np.mean(agent_rewards):.2f}")
-        print(f"Average Profit: ${np.mean(agent_profits):.2f}")
-        print(f"Average Completion Rate: {np.mean(agent_completion_rates):.1%}")
+            print(f"Average Reward: {np.mean(agent_rewards):.2f}")
+            print(f"Average Profit: ${np.mean(agent_profits):.2f}")
+            print(f"Average Completion Rate: {np.mean(agent_completion_rates):.1%}")
+    finally:
+        if executor:
+            executor.shutdown()
+        else:
+            _close_baseline_worker()
     
     # Try to load and evaluate trained RL agent
     try:
         from stable_baselines3 import PPO
         model = PPO.load("warehouse_ppo")
         print(f"\nEvaluating trained PPO agent...")
-        rl_results = evaluate_agent(model, env, n_episodes)
+        # Same per-episode seeds as the baselines, so every agent sees the same episodes
+        rl_results = evaluate_agent(model, env, n_episodes, seeds=range(n_episodes))
         results['PPO'] = rl_results
     except:
         print("No trained PPO model found. Train first with train_ppo_agent()")
@@ -339,11 +383,15 @@ if __name__ == "__main__":
                       help="Number of training timesteps")
     parser.add_argument("--episodes", type=int, default=20,
                       help="Number of evaluation episodes")
+    parser.add_argument("--num-envs", type=int, default=1,
+                      help="Number of parallel training environments")
+    parser.add_argument("--workers", type=int, default=1,
+                      help="Worker processes for baseline evaluation in compare mode")
     
     args = parser.parse_args()
     
     if args.mode == "train":
-        train_ppo_agent(total_timesteps=args.timesteps)
+        train_ppo_agent(total_timesteps=args.timesteps, n_envs=args.num_envs)
     elif args.mode == "evaluate":
         try:
             model = PPO.load("warehouse_ppo")
@@ -352,6 +400,6 @@ if __name__ == "__main__":
         except:
             print("No trained model found. Train first with --mode train")
     elif args.mode == "compare":
-        compare_agents(n_episodes=args.episodes)
+        compare_agents(n_episodes=args.episodes, workers=args.workers)
     elif args.mode == "curriculum":
         curriculum_training()
\ No newline at end of file
@@ -330,7 +330,7 @@ class PygameRenderer:
         
         # Total relocations
         total_relocations = len(self.env.relocations_history)
-        completed_relocations = sum(1 for r in self.env.relocations_history if r['status'] == 'completed')
+        completed_relocations = self.env.completed_relocations  # Kept incrementally by the env
         
         summary_text = f"Total: {total_relocations} | Completed: {completed_relocations}"
         summary_surface = self.font_medium.render(summary_text, True, self.colors['text'])